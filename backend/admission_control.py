@@ -0,0 +1,331 @@
+"""
+Admission Control for YouTube Legal Advisor AI Bot
+=================================================
+
+This module keeps fast endpoints responsive while slow LLM work is saturated:
+- Separate "fast", "slow" and "poll" (job long-poll) lanes, each with its own concurrency
+  limit and bounded queue
+- Per-endpoint concurrency caps inside a lane
+- Immediate 429 + Retry-After when a queue is full or the wait budget runs out
+- A cap on every request a lane holds (running or queued at any gate), so queued
+  requests can never park all of a worker's threads
+- Queue-wait-time metrics per lane
+
+Endpoints that are not listed (health checks, static files, the index page) are never queued.
+Limits apply per worker process, so run gunicorn with threaded workers (gthread).
+Each queued request holds a worker thread while it waits, so keep the sum of every
+lane's max_concurrent + max_queue below the thread count (ADMISSION_WORKER_THREADS).
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from flask import g, jsonify, request
+from collections import deque
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+ADMISSION_WORKER_THREADS = int(os.getenv("ADMISSION_WORKER_THREADS", "8"))   # gunicorn --threads per worker
+
+# Lane limits: concurrent requests, queued requests, and max seconds to wait in queue.
+# Defaults hold at most 7 of 8 threads across all lanes (slow 4, fast 2, poll 1),
+# so health checks always find a free one.
+ADMISSION_LANES = {
+    "fast": {
+        "max_concurrent": int(os.getenv("ADMISSION_FAST_CONCURRENCY", "2")),
+        "max_queue": int(os.getenv("ADMISSION_FAST_QUEUE", "0")),
+        "max_wait": float(os.getenv("ADMISSION_FAST_MAX_WAIT", "2")),
+    },
+    "slow": {
+        "max_concurrent": int(os.getenv("ADMISSION_SLOW_CONCURRENCY", "3")),
+        "max_queue": int(os.getenv("ADMISSION_SLOW_QUEUE", "1")),
+        "max_wait": float(os.getenv("ADMISSION_SLOW_MAX_WAIT", "10")),
+    },
+    "poll": {
+        "max_concurrent": int(os.getenv("ADMISSION_POLL_CONCURRENCY", "1")),
+        "max_queue": int(os.getenv("ADMISSION_POLL_QUEUE", "0")),
+        "max_wait": float(os.getenv("ADMISSION_POLL_MAX_WAIT", "1")),
+    },
+}
+
+# Flask endpoint name -> (lane, per-endpoint concurrency cap)
+ENDPOINT_ADMISSION = {
+    "simplify": ("slow", 2),
+    "upload_contract": ("slow", 2),
+    "content_check": ("slow", 2),
+    "youtube_policy": ("slow", 3),
+    "ama": ("slow", 3),
+    "invoice": ("fast", 2),
+    "download_invoice_pdf": ("fast", 2),
+    "submit_job": ("fast", 2),
+    "job_status": ("poll", 1),          # Long-polls hold a thread for up to JOB_MAX_WAIT seconds
+}
+
+WAIT_SAMPLE_SIZE = 1000                 # Recent queue waits kept for percentile metrics
+
+
+# ==================== EXCEPTIONS ====================
+class AdmissionRejected(Exception):
+    """
+    🚦 Raised when a request cannot be admitted (queue full or wait timed out)
+    """
+
+    def __init__(self, lane, reason, retry_after):
+        super().__init__(f"{lane} lane rejected request: {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# ==================== CONCURRENCY GATE ====================
+class AdmissionGate:
+    """
+    🚧 Counting gate with a bounded wait queue
+
+    Args:
+        name (str): Gate name used in metrics and errors
+        max_concurrent (int): Requests allowed to run at once
+        max_queue (int): Requests allowed to wait for a slot
+        max_wait (float): Seconds a request may wait before being rejected
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, max_wait):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.occupants = 0                  # Requests holding a thread in this lane, at any gate
+        self.rejected = 0
+        self._condition = threading.Condition()
+        self._waits = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._service_times = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def enter(self):
+        """
+        🚪 Count a request against the lane before it waits at any gate
+
+        A lane never holds more than max_concurrent + max_queue requests, including
+        those still queued at an endpoint gate, so it cannot park more threads than that.
+
+        Raises:
+            AdmissionRejected: If the lane is already full
+        """
+        with self._condition:
+            if self.occupants >= self.max_concurrent + self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(self.name, "lane full", self._retry_after())
+            self.occupants += 1
+
+    def leave(self):
+        """
+        🚪 Undo enter() once the request is finished or rejected
+        """
+        with self._condition:
+            self.occupants -= 1
+
+    def acquire(self, deadline=None):
+        """
+        🎟️ Take a slot, waiting in the queue if needed
+
+        Args:
+            deadline (float): time.monotonic() by which a slot must be taken; shared
+                by the endpoint and lane gates so the total wait stays within max_wait
+
+        Returns:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            AdmissionRejected: If the queue is full or the deadline passes
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                self._waits.append(0.0)
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(self.name, "queue full", self._retry_after())
+
+            self.waiting += 1
+            start = time.monotonic()
+            try:
+                admitted = self._condition.wait_for(lambda: self.active < self.max_concurrent,
+                                                    timeout=max(0.0, deadline - time.monotonic()))
+            finally:
+                self.waiting -= 1
+
+            waited = time.monotonic() - start
+            if not admitted:
+                self.rejected += 1
+                raise AdmissionRejected(self.name, "queue wait timed out", self._retry_after())
+
+            self.active += 1
+            self._waits.append(waited)
+            return waited
+
+    def release(self, service_time=None):
+        """
+        🔓 Free a slot and wake the next waiter
+
+        Args:
+            service_time (float): Seconds the request held the slot, for Retry-After estimates
+        """
+        with self._condition:
+            self.active -= 1
+            if service_time is not None:
+                self._service_times.append(service_time)
+            self._condition.notify()
+
+    def _retry_after(self):
+        """
+        ⏱️ Estimate seconds until a slot frees up (caller holds the lock)
+        """
+        if not self._service_times:
+            return 1
+        average_service = sum(self._service_times) / len(self._service_times)
+        backlog = (self.waiting + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(average_service * backlog))
+
+    def snapshot(self):
+        """
+        📊 Return current load and queue-wait percentiles for this gate
+        """
+        with self._condition:
+            waits = sorted(self._waits)
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "occupants": self.occupants,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "queue_wait_ms": {
+                    "samples": len(waits),
+                    "p50": _percentile_ms(waits, 0.50),
+                    "p95": _percentile_ms(waits, 0.95),
+                    "max": _percentile_ms(waits, 1.0),
+                },
+            }
+
+
+def _percentile_ms(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
+
+
+# ==================== FLASK INTEGRATION ====================
+class AdmissionController:
+    """
+    🚦 Flask hooks that admit /api requests through lane and endpoint gates
+
+    Usage:
+        admission_controller = AdmissionController(app)
+    """
+
+    def __init__(self, app=None, lanes=None, endpoints=None):
+        lanes = lanes or ADMISSION_LANES
+        endpoints = endpoints or ENDPOINT_ADMISSION
+        self.lanes = {name: AdmissionGate(name, **limits) for name, limits in lanes.items()}
+        self.endpoint_gates = {}
+        for endpoint, (lane, max_concurrent) in endpoints.items():
+            lane_limits = lanes[lane]
+            self.endpoint_gates[endpoint] = (
+                self.lanes[lane],
+                AdmissionGate(endpoint, max_concurrent, lane_limits["max_queue"], lane_limits["max_wait"]),
+            )
+        # 🧵 Lanes fill up independently, so only their combined capacity bounds the threads held
+        total_slots = sum(limits["max_concurrent"] + limits["max_queue"] for limits in lanes.values())
+        if total_slots >= ADMISSION_WORKER_THREADS:
+            logger.warning(f"Admission lanes can hold {total_slots} requests together but workers have "
+                           f"{ADMISSION_WORKER_THREADS} threads; health checks can queue behind them")
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        ⚙️ Register before/after/teardown hooks on the application
+        """
+        app.before_request(self.admit)
+        app.after_request(self.add_queue_headers)
+        app.teardown_request(self.release)
+
+    def admit(self):
+        """
+        🎟️ Before-request hook: queue the request or reject it with 429
+        """
+        gates = self.endpoint_gates.get(request.endpoint)
+        if gates is None:
+            return None
+
+        lane_gate, endpoint_gate = gates
+        deadline = time.monotonic() + lane_gate.max_wait
+        try:
+            lane_gate.enter()
+        except AdmissionRejected as rejection:
+            return self._reject(rejection)
+        try:
+            waited = endpoint_gate.acquire(deadline)
+        except AdmissionRejected as rejection:
+            lane_gate.leave()
+            return self._reject(rejection)
+        try:
+            waited += lane_gate.acquire(deadline)
+        except AdmissionRejected as rejection:
+            endpoint_gate.release()
+            lane_gate.leave()
+            return self._reject(rejection)
+
+        g.admission_gates = gates
+        g.admission_started = time.monotonic()
+        g.queue_wait = waited
+        return None
+
+    def add_queue_headers(self, response):
+        """
+        📨 After-request hook: expose the queue wait to clients and load tests
+        """
+        if "queue_wait" in g:
+            response.headers["X-Queue-Wait-Ms"] = f"{g.queue_wait * 1000:.1f}"
+        return response
+
+    def release(self, error=None):
+        """
+        🔓 Teardown hook: free the slots taken in admit()
+        """
+        gates = g.pop("admission_gates", None)
+        if gates is None:
+            return
+        service_time = time.monotonic() - g.pop("admission_started")
+        for gate in gates:
+            gate.release(service_time)
+        gates[0].leave()
+
+    def _reject(self, rejection):
+        response = jsonify({
+            "error": "Server busy",
+            "message": "Too many requests are being processed. Please retry shortly.",
+            "code": 429,
+        })
+        response.status_code = 429
+        response.headers["Retry-After"] = str(rejection.retry_after)
+        return response
+
+    def snapshot(self):
+        """
+        📊 Return load and queue-wait metrics for every lane and endpoint
+        """
+        return {
+            "lanes": {name: gate.snapshot() for name, gate in self.lanes.items()},
+            "endpoints": {name: gates[1].snapshot() for name, gates in self.endpoint_gates.items()},
+        }
@@ -0,0 +1,138 @@
+"""
+AMA Conversation Sessions for YouTube Legal Advisor AI Bot
+=========================================================
+
+Follow-up questions in the AMA need earlier context, but replaying the whole
+exchange makes every prompt longer than the last. This module keeps a compact
+server-side memory per conversation:
+- The most recent turns are kept verbatim (each trimmed to a fixed size)
+- Older turns are folded into a running summary with a hard size cap
+- Sessions are stored in SQLite so every worker process sees the same conversation
+  and idle sessions expire after a TTL
+
+The prompt built from a session is therefore bounded no matter how long the
+conversation runs; vector_database.py does the summarising and answering.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# ==================== APPLICATION CONFIGURATION ====================
+AMA_SESSION_PATH = os.getenv("AMA_SESSION_PATH", "cache/ama_sessions.sqlite3")
+AMA_SESSION_TTL = float(os.getenv("AMA_SESSION_TTL", "86400"))                 # Seconds an idle session is kept
+AMA_RECENT_TURNS = int(os.getenv("AMA_RECENT_TURNS", "3"))                     # Turns kept verbatim in the prompt
+AMA_TURN_MAX_CHARACTERS = int(os.getenv("AMA_TURN_MAX_CHARACTERS", "1200"))    # Per question/answer in the prompt
+AMA_SUMMARY_MAX_CHARACTERS = int(os.getenv("AMA_SUMMARY_MAX_CHARACTERS", "1500"))
+PURGE_EVERY_WRITES = 200                                                       # How often expired sessions are deleted
+
+
+# ==================== HELPERS ====================
+def trim_text(text, limit):
+    """
+    ✂️ Cut text to at most `limit` characters, on a word boundary where possible
+    """
+    text = text.strip()
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut + " …"
+
+
+def format_turns(turns):
+    """
+    🗒️ Render verbatim turns as a compact transcript for prompts
+
+    Args:
+        turns (list): Dicts with "question" and "answer"
+
+    Returns:
+        str: "Creator: ...\\nRohit: ..." lines, or "(none)" when empty
+    """
+    if not turns:
+        return "(none)"
+    return "\n".join(
+        f"Creator: {trim_text(turn['question'], AMA_TURN_MAX_CHARACTERS)}\n"
+        f"Rohit: {trim_text(turn['answer'], AMA_TURN_MAX_CHARACTERS)}"
+        for turn in turns
+    )
+
+
+# ==================== SESSION STORE ====================
+class SessionStore:
+    """
+    🗂️ SQLite-backed store of AMA conversations (summary + recent turns)
+
+    Args:
+        path (str): SQLite database file; parent directories are created
+        ttl (float): Seconds a session survives without activity
+    """
+
+    def __init__(self, path=AMA_SESSION_PATH, ttl=AMA_SESSION_TTL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS ama_sessions ("
+            " session_id TEXT PRIMARY KEY, summary TEXT NOT NULL, turns TEXT NOT NULL,"
+            " turn_count INTEGER NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_ama_updated ON ama_sessions (updated_at)")
+        self._connection.commit()
+
+    def load(self, session_id=None):
+        """
+        📂 Fetch a live session, or start a new one
+
+        Args:
+            session_id (str): Existing session id from the client (optional)
+
+        Returns:
+            dict: session_id, summary, turns (recent verbatim turns), turn_count, is_new
+        """
+        if session_id:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT summary, turns, turn_count FROM ama_sessions WHERE session_id = ? AND updated_at > ?",
+                    (session_id, time.time() - self.ttl),
+                ).fetchone()
+            if row:
+                return {"session_id": session_id, "summary": row[0], "turns": json.loads(row[1]),
+                        "turn_count": row[2], "is_new": False}
+        return {"session_id": uuid.uuid4().hex, "summary": "", "turns": [], "turn_count": 0, "is_new": True}
+
+    def save(self, session):
+        """
+        💾 Persist a session after a turn
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO ama_sessions VALUES (?, ?, ?, ?, ?)",
+                (session["session_id"], session["summary"], json.dumps(session["turns"]),
+                 session["turn_count"], time.time()),
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                self._connection.execute("DELETE FROM ama_sessions WHERE updated_at <= ?", (time.time() - self.ttl,))
+            self._connection.commit()
+
+    def delete(self, session_id):
+        """
+        🗑️ Forget a conversation
+
+        Returns:
+            bool: True if the session existed
+        """
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM ama_sessions WHERE session_id = ?", (session_id,))
+            self._connection.commit()
+        return cursor.rowcount > 0
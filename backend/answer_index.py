@@ -0,0 +1,303 @@
+"""
+Precomputed Answer Index for YouTube Legal Advisor AI Bot
+========================================================
+
+Most policy traffic is the same canonical questions asked again and again.
+This module answers them ahead of time:
+- Collects canonical policy questions from faq_questions.txt
+- Runs each through the policy RAG pipeline offline and stores the answer,
+  with the question's embedding, in a local SQLite index
+- Matches live questions by normalised text, then by cosine similarity of
+  their embeddings, so hits are served in milliseconds without an LLM call
+- Stamps every answer with the vector store version it was built from; answers
+  built from an older store are never served
+
+Run after every vector store rebuild (vector_namespaces.py does this automatically):
+    python answer_index.py
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from llm_scheduler import LLMCapacityError
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+BACKEND_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ANSWER_INDEX_PATH = os.getenv("ANSWER_INDEX_PATH", "cache/answer_index.sqlite3")
+FAQ_QUESTIONS_PATH = os.getenv("FAQ_QUESTIONS_PATH", os.path.join(BACKEND_DIRECTORY, "faq_questions.txt"))
+ANSWER_MATCH_THRESHOLD = float(os.getenv("ANSWER_MATCH_THRESHOLD", "0.92"))   # Cosine similarity needed to reuse an answer
+RELOAD_INTERVAL = 30                        # Seconds between checks for answers written by the precompute job
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# ==================== QUESTION SOURCES ====================
+def normalize_question(question):
+    """
+    🔤 Lowercase, collapse whitespace and drop trailing punctuation for exact matching
+    """
+    return _WHITESPACE.sub(" ", question.lower()).strip(" ?!.")
+
+
+def load_canonical_questions(questions_path=FAQ_QUESTIONS_PATH):
+    """
+    📋 Read canonical policy questions from the questions file
+
+    Only YouTube-policy questions belong here: each is answered by the policy RAG
+    prompt, which cannot answer product questions like those on the FAQ page.
+
+    Args:
+        questions_path (str): Text file, one question per line ("#" starts a comment)
+
+    Returns:
+        list: Unique questions in file order
+    """
+    questions = []
+    if os.path.exists(questions_path):
+        with open(questions_path, encoding="utf-8") as handle:
+            questions += [line.strip() for line in handle if line.strip() and not line.lstrip().startswith("#")]
+    unique = {}
+    for question in questions:
+        unique.setdefault(normalize_question(question), question)
+    return list(unique.values())
+
+
+def vector_store_version(store_path):
+    """
+    🏷️ Content hash of a saved FAISS store, used as the answers' freshness stamp
+
+    Args:
+        store_path (str): Directory holding index.faiss and index.pkl
+
+    Returns:
+        str: 16-character hex digest
+    """
+    digest = hashlib.sha256()
+    for name in ("index.faiss", "index.pkl"):
+        with open(os.path.join(store_path, name), "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+# ==================== ANSWER INDEX ====================
+class AnswerIndex:
+    """
+    🗄️ SQLite store of precomputed answers with an in-memory nearest-neighbour matcher
+
+    Args:
+        index_version (str): Vector store version answers must have been built from
+        model (str): LLM and embedder identifier; answers built with another LLM or
+            embedder are ignored (their question embeddings are not comparable)
+        path (str): SQLite database file; parent directories are created
+        threshold (float): Minimum cosine similarity for an embedding match
+    """
+
+    def __init__(self, index_version, model, path=ANSWER_INDEX_PATH, threshold=ANSWER_MATCH_THRESHOLD):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.index_version = index_version
+        self.model = model
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS precomputed_answers ("
+            " normalized TEXT NOT NULL, index_version TEXT NOT NULL, model TEXT NOT NULL,"
+            " question TEXT NOT NULL, answer TEXT NOT NULL, embedding BLOB NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (normalized, index_version, model))"
+        )
+        self._connection.commit()
+        self._loaded = ([], {}, None)            # (entries, normalised text -> position, embedding matrix)
+        self._loaded_state = None
+        self._checked_at = 0.0
+        self._reload()
+
+    # ==================== LOADING ====================
+    def _reload(self):
+        """
+        🔄 Load current-version answers into memory if the table changed
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            state = self._connection.execute(
+                "SELECT COUNT(*), MAX(created_at) FROM precomputed_answers WHERE index_version = ? AND model = ?",
+                (self.index_version, self.model),
+            ).fetchone()
+            if state == self._loaded_state:
+                return
+            rows = self._connection.execute(
+                "SELECT question, answer, embedding, created_at FROM precomputed_answers"
+                " WHERE index_version = ? AND model = ? ORDER BY created_at",
+                (self.index_version, self.model),
+            ).fetchall()
+            self._loaded_state = state
+
+        entries = [{"question": question, "answer": answer, "created_at": created_at}
+                   for question, answer, _, created_at in rows]
+        matrix = None
+        if rows:
+            matrix = np.vstack([np.frombuffer(embedding, dtype=np.float32) for _, _, embedding, _ in rows])
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        by_text = {normalize_question(entry["question"]): index for index, entry in enumerate(entries)}
+        self._loaded = (entries, by_text, matrix)
+        if entries:
+            logger.info(f"Loaded {len(entries)} precomputed answers for index version {self.index_version}")
+
+    def _maybe_reload(self):
+        if time.monotonic() - self._checked_at >= RELOAD_INTERVAL:
+            self._reload()
+
+    def has_answers(self):
+        """
+        ❓ True when any answer exists for the current index version
+        """
+        self._maybe_reload()
+        return bool(self._loaded[0])
+
+    # ==================== MATCHING ====================
+    def _hit(self, entry, similarity):
+        return {
+            "answer": entry["answer"],
+            "precomputed": {
+                "matched_question": entry["question"],
+                "similarity": round(similarity, 4),
+                "index_version": self.index_version,
+                "created_at": entry["created_at"],
+            },
+        }
+
+    def match_text(self, question):
+        """
+        🎯 Exact match on the normalised question text
+
+        Returns:
+            dict | None: {"answer", "precomputed": {...}} on a hit
+        """
+        self._maybe_reload()
+        entries, by_text, _ = self._loaded
+        index = by_text.get(normalize_question(question))
+        return self._hit(entries[index], 1.0) if index is not None else None
+
+    def match_vector(self, query_vector):
+        """
+        🧭 Nearest canonical question by cosine similarity
+
+        Args:
+            query_vector (array): Embedding of the live question
+
+        Returns:
+            dict | None: {"answer", "precomputed": {...}} if the best match clears the threshold
+        """
+        entries, _, matrix = self._loaded
+        if matrix is None:
+            return None
+        vector = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._hit(entries[best], float(similarities[best]))
+
+    # ==================== WRITING ====================
+    def contains(self, question):
+        """
+        🔍 True if the question already has an answer for the current version
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM precomputed_answers WHERE normalized = ? AND index_version = ? AND model = ?",
+                (normalize_question(question), self.index_version, self.model),
+            ).fetchone()
+        return row is not None
+
+    def put(self, question, answer, embedding):
+        """
+        💾 Store one precomputed answer with its question embedding
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO precomputed_answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_question(question), self.index_version, self.model, question, answer,
+                 np.asarray(embedding, dtype=np.float32).reshape(-1).tobytes(), time.time()),
+            )
+            self._connection.commit()
+
+    def prune_stale(self):
+        """
+        🧹 Delete answers built from other index versions or models
+
+        Returns:
+            int: Rows removed
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM precomputed_answers WHERE index_version != ? OR model != ?",
+                (self.index_version, self.model),
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    def snapshot(self):
+        """
+        📊 Current version and number of answers being served
+        """
+        return {"index_version": self.index_version, "answers": len(self._loaded[0]), "threshold": self.threshold}
+
+
+# ==================== PRECOMPUTE JOB ====================
+def precompute_answers(index, questions, answer_fn, embed_fn):
+    """
+    🏗️ Answer every canonical question that has no answer for the current version
+
+    Resumable: already-answered questions are skipped, and rate-limit rejections
+    wait for the scheduler's Retry-After instead of failing the run.
+
+    Args:
+        index (AnswerIndex): Destination index
+        questions (list): Canonical questions
+        answer_fn (callable): question -> answer text
+        embed_fn (callable): question -> embedding vector
+
+    Returns:
+        dict: Counts of answered and skipped questions
+    """
+    answered = skipped = 0
+    for question in questions:
+        if index.contains(question):
+            skipped += 1
+            continue
+        while True:
+            try:
+                answer = answer_fn(question)
+                break
+            except LLMCapacityError as error:
+                logger.warning(f"Rate limited while precomputing; waiting {error.retry_after}s")
+                time.sleep(error.retry_after)
+        index.put(question, answer, embed_fn(question))
+        answered += 1
+        logger.info(f"Precomputed answer {answered}: {question[:60]}")
+    return {"answered": answered, "skipped": skipped}
+
+
+# ==================== COMMAND LINE ====================
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    from vector_database import answer_index, handle_policy_query, namespaced_store
+
+    canonical_questions = load_canonical_questions()
+    counts = precompute_answers(answer_index, canonical_questions, handle_policy_query, namespaced_store.embed)
+    removed = answer_index.prune_stale()
+    print(f"Precomputed {counts['answered']} answers ({counts['skipped']} already current, "
+          f"{removed} stale removed) for index version {answer_index.index_version}")
@@ -1,12 +1,37 @@
 # ==================== FLASK API SERVER CONFIGURATION ====================
-from flask import Flask, request, jsonify, render_template, send_file
-from vector_database import handle_policy_query, simplify_contract_text, analyze_content_safety, create_professional_invoice, process_legal_assistant_query
+from flask import Flask, request, jsonify, render_template, send_file, g
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# 🧵 Spawned PDF extraction workers re-import this file as "__mp_main__" when it is run as
+# "python app.py"; they only run contract_extraction code, so they skip the vector store,
+# LLM clients and background job workers
+EXTRACTION_WORKER_PROCESS = __name__ == "__mp_main__"
+if not EXTRACTION_WORKER_PROCESS:
+    from vector_database import answer_policy_question, analyze_contract_clauses, analyze_content_safety, create_professional_invoice, process_legal_assistant_turn, llm_scheduler, namespaced_store, answer_index
+from llm_scheduler import LLMCapacityError
+from llm_backends import model_timer
+from contract_extraction import StreamedUploadRequest, ContractExtractionError, extract_uploaded_contract, CONTRACT_UPLOAD_MAX_BYTES, CONTRACT_REQUEST_MAX_BYTES
+from response_optimization import ResponseOptimizer
+from admission_control import AdmissionController
+from request_profiling import RequestProfiler
+from structured_logging import configure_logging, RequestLogger, timed_stage
+from job_queue import JobManager
+from ama_sessions import SessionStore
 from flask_cors import CORS
 import io
 import logging
-import traceback
+import math
+import time
 from datetime import datetime
 
+# 📄 Optional PDF support - WeasyPrint needs system libraries that may be missing
+try:
+    from weasyprint import HTML
+    WEASYPRINT_AVAILABLE = True
+except (ImportError, OSError):
+    HTML = None
+    WEASYPRINT_AVAILABLE = False
+
 # 🚀 Initialize Flask Application
 # ================================
 # This section initializes the Flask application with necessary configurations
@@ -19,14 +44,61 @@ app = Flask(
     template_folder="templates"
 )
 
+# 📥 Stream file uploads to temp files on disk instead of buffering them in memory
+app.request_class = StreamedUploadRequest
 
-# 🎯 Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(name)s %(message)s'
-)
+# 📏 Werkzeug stops reading any body past this size, including chunked uploads without Content-Length
+app.config["MAX_CONTENT_LENGTH"] = CONTRACT_REQUEST_MAX_BYTES
+
+# 📋 Request ids and one structured access log line (with per-stage durations) per request
+request_logger = RequestLogger(app, stage_sources=lambda: {
+    "model": model_timer.total(),
+    "queue": g.get("queue_wait", 0.0),
+})
+
+# ⏱️ Split each request into model time and our own framework overhead
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    model_timer.reset()
+
+@app.after_request
+def add_server_timing(response):
+    """
+    ⏱️ Report model, queue and framework time in a Server-Timing header
+    """
+    if "request_started" not in g:
+        return response
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+    model_ms = model_timer.total() * 1000
+    queue_ms = g.get("queue_wait", 0.0) * 1000
+    app_ms = max(0.0, total_ms - model_ms - queue_ms)
+    response.headers["Server-Timing"] = f"model;dur={model_ms:.1f}, queue;dur={queue_ms:.1f}, app;dur={app_ms:.1f}"
+    return response
+
+# 🗜️ Compression, ETags and immutable caching for fingerprinted static assets
+response_optimizer = ResponseOptimizer(app)
+
+# 🚦 Per-endpoint concurrency limits so slow LLM routes cannot starve fast ones
+admission_controller = AdmissionController(app)
+
+# 🔬 Opt-in sampling profiler (X-Profile header or PROFILE_SAMPLE_RATE); no hooks when disabled
+request_profiler = RequestProfiler(app)
+
+# 🧵 Background jobs for long analyses that outlive a client's request timeout
+job_manager = JobManager({
+    "contract_simplify": lambda payload: analyze_contract_clauses(payload["text"]),
+    "content_check": lambda payload: {"report": analyze_content_safety(payload["text"])},
+})
+if not EXTRACTION_WORKER_PROCESS:
+    job_manager.start()
+
+# 🧠 Server-side AMA conversations (rolling summary + recent turns)
+ama_sessions = SessionStore()
+
+# 🎯 Configure logging: JSON lines written by a background thread, never blocking requests
+configure_logging()
 logger = logging.getLogger(__name__)
-n
 
 # 🎯 TODO: Add configuration management system
 # Future enhancement: Move to config.py for better organization
@@ -79,14 +151,30 @@ def internal_error(error):
     Returns:
         JSON response with error details and 500 status code
     """
-    logger.error(f"500 Internal Server Error: {error}")
-    logger.error(traceback.format_exc())
+    logger.exception(f"500 Internal Server Error: {error}")
     return jsonify({
         "error": "Internal server error", 
         "message": "An unexpected error occurred. Please try again later.",
         "code": 500
     }), 500
 
+def llm_capacity_response(error):
+    """
+    ⏳ Build a 429 response when the outbound LLM rate-limit budget is exhausted
+    Args:
+        error (LLMCapacityError): The shed-load error with a retry hint
+    Returns:
+        JSON response with error details, 429 status code and Retry-After header
+    """
+    response = jsonify({
+        "error": "AI service is busy",
+        "message": "The AI model is at its rate limit. Please try again shortly.",
+        "code": 429
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
 # ==================== ROUTE DEFINITIONS ====================
 
 @app.route("/")
@@ -96,8 +184,8 @@ def index():
     Returns: Rendered HTML template for the main page
     """
     # 🎨 DEBUG: Main page accessed - tracking user engagement
-    # 📊 Monitoring: Page view counter could be implemented here
-    print("🎨 Debug: Main advisor interface accessed")
+    # 📊 Monitoring: Page views are counted by the access log
+    logger.debug("Main advisor interface accessed")
     return render_template("advisor.html")
 
 @app.route("/api/contract/simplify", methods=["POST"])
@@ -123,18 +211,67 @@ def simplify():
             logger.warning("Contract simplification attempted with empty text")
             return jsonify({"error": "Contract text is required"}), 400
         
-        # 🚀 Process contract simplification using NLP pipeline
-        summary = simplify_contract_text(text)
+        # 🚀 Process contract simplification clause by clause (unchanged clauses come from cache)
+        result = analyze_contract_clauses(text)
         
         # 🎨 Log successful processing
-        logger.info(f"Contract simplification completed for {len(text)} characters")
+        logger.info(f"Contract simplification completed for {len(text)} characters "
+                    f"({result['clause_cache']['analyzed']}/{result['clause_cache']['clauses']} clauses analyzed)")
+        return jsonify(result)
+    except LLMCapacityError as e:
+        logger.warning(f"LLM capacity exhausted during contract simplification: {str(e)}")
+        return llm_capacity_response(e)
+    except Exception as e:
+        logger.exception(f"Error in contract simplification: {str(e)}")
+        return jsonify({"error": "Failed to process contract"}), 500
+
+
+
+@app.route("/api/contract/upload", methods=["POST"])
+def upload_contract():
+    """
+    📤 Simplify an uploaded contract file (PDF or plain text)
+    Multipart Data: file=<contract.pdf>, text=<optional pasted text>
+    Returns: JSON with simplified contract summary and extraction stats
+    
+    Enhancement: Upload is streamed to disk and PDF pages are extracted in parallel
+    """
+    if request.content_length and request.content_length > CONTRACT_UPLOAD_MAX_BYTES:
+        logger.warning(f"Contract upload rejected: {request.content_length} bytes exceeds limit")
+        return jsonify({"error": "Uploaded file is too large", "code": 413}), 413
+
+    try:
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            logger.warning("Contract upload attempted without a file")
+            return jsonify({"error": "Contract file is required"}), 400
+
+        # 📄 Extract clean text from the uploaded file
+        with timed_stage("extraction"):
+            file_text, extraction = extract_uploaded_contract(upload)
+        text = "\n".join(part for part in (request.form.get("text", "").strip(), file_text) if part)
+        if not text:
+            logger.warning("Contract upload contained no readable text")
+            return jsonify({"error": "No readable text found in the uploaded contract"}), 422
+
+        # 🚀 Process contract simplification clause by clause (unchanged clauses come from cache)
+        result = analyze_contract_clauses(text)
         
-        # 🎨 TODO: Add caching mechanism for repeated requests
-        # Enhancement idea: Implement Redis cache for frequently requested contracts
-        return jsonify({"summary": summary})
+        # 🎨 Log successful processing
+        logger.info(f"Uploaded contract simplified: {extraction['pages']} pages, "
+                    f"{extraction['characters']} characters, extracted in {extraction['extract_ms']} ms")
+        return jsonify(dict(result, extraction=extraction))
+    except ContractExtractionError as e:
+        logger.warning(f"Contract extraction failed: {str(e)}")
+        return jsonify({"error": str(e), "code": e.status_code}), e.status_code
+    except RequestEntityTooLarge:
+        logger.warning("Contract upload rejected: body exceeds limit while streaming")
+        return jsonify({"error": "Uploaded file is too large", "code": 413}), 413
+    except LLMCapacityError as e:
+        logger.warning(f"LLM capacity exhausted during contract upload: {str(e)}")
+        return llm_capacity_response(e)
     except Exception as e:
-        logger.error(f"Error in contract simplification: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in contract upload: {str(e)}")
         return jsonify({"error": "Failed to process contract"}), 500
 
 
@@ -168,13 +305,74 @@ def content_check():
         # 🎨 Log successful processing
         logger.info(f"Content safety check completed for {len(text)} characters")
         return jsonify({"report": report})
+    except LLMCapacityError as e:
+        logger.warning(f"LLM capacity exhausted during content safety check: {str(e)}")
+        return llm_capacity_response(e)
     except Exception as e:
-        logger.error(f"Error in content safety check: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in content safety check: {str(e)}")
         return jsonify({"error": "Failed to analyze content"}), 500
 
 
 
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    """
+    🧵 Queue a contract simplification or content safety check as a background job
+    POST Data: { "type": "contract_simplify" | "content_check", "text": "..." }
+    Returns: 202 with the job id and a poll URL (identical submissions share one job)
+    
+    Enhancement: Jobs keep running if the client disconnects; poll /api/jobs/<job_id>
+    """
+    try:
+        data = request.get_json()
+        if data is None:
+            logger.warning("Job submission attempted with invalid JSON")
+            return jsonify({"error": "Invalid JSON data"}), 400
+
+        job_type = data.get("type", "")
+        text = data.get("text", "")
+        if job_type not in job_manager.handlers:
+            logger.warning(f"Job submission attempted with unknown type: {job_type}")
+            return jsonify({"error": f"Job type must be one of: {', '.join(job_manager.handlers)}"}), 400
+        if not text:
+            logger.warning("Job submission attempted with empty text")
+            return jsonify({"error": "Text is required"}), 400
+
+        # 📥 Queue the job (or reuse a retained job for the same input)
+        job, deduplicated = job_manager.submit(job_type, {"text": text})
+        
+        # 🎨 Log successful submission
+        logger.info(f"Job {job['job_id']} ({job_type}) submitted for {len(text)} characters"
+                    f"{' (deduplicated)' if deduplicated else ''}")
+        job.update(deduplicated=deduplicated, poll_url=f"/api/jobs/{job['job_id']}")
+        return jsonify(job), 202
+    except Exception as e:
+        logger.exception(f"Error in job submission: {str(e)}")
+        return jsonify({"error": "Failed to submit job"}), 500
+
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    """
+    📬 Poll a background job
+    Query Params: wait=<seconds> to long-poll until the job finishes (max 25)
+    Returns: JSON with status (queued, running, succeeded, failed) and result or error
+    """
+    try:
+        wait = request.args.get("wait", 0, type=float)
+        if not math.isfinite(wait):
+            return jsonify({"error": "wait must be a finite number of seconds", "code": 400}), 400
+        job = job_manager.get(job_id, wait=wait)
+        if job is None:
+            return jsonify({"error": "Job not found or expired", "code": 404}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.exception(f"Error fetching job {job_id}: {str(e)}")
+        return jsonify({"error": "Failed to fetch job"}), 500
+
+
+
 @app.route("/api/invoice/generate", methods=["POST"])
 def invoice():
     """
@@ -215,8 +413,7 @@ def invoice():
         logger.warning(f"Invalid input parameters for invoice generation: {str(e)}")
         return jsonify({"error": "Invalid input parameters", "details": str(e)}), 400
     except Exception as e:
-        logger.error(f"Error in invoice generation: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in invoice generation: {str(e)}")
         return jsonify({"error": "Failed to generate invoice"}), 500
 
 
@@ -257,8 +454,7 @@ def download_invoice_pdf():
             mimetype="application/pdf"
         )
     except Exception as e:
-        logger.error(f"Error in PDF generation: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in PDF generation: {str(e)}")
         return jsonify({"error": "Failed to generate PDF"}), 500
 
 
@@ -286,17 +482,18 @@ def youtube_policy():
             logger.warning("YouTube policy query attempted with empty question")
             return jsonify({"error": "Policy question is required"}), 400
         
-        # 🎬 Get policy response from vector database using RAG pipeline
-        answer = handle_policy_query(question)
+        # 🎬 Serve canonical questions from the precomputed index, others via the RAG pipeline
+        result = answer_policy_question(question)
         
         # 🎨 Log successful processing
-        logger.info(f"Policy response generated for question: {question[:50]}...")
-        # 🎯 TODO: Add response caching for common questions
-        # Enhancement: Implement LRU cache for frequently asked policy questions
-        return jsonify({"answer": answer})
+        source = "precomputed index" if "precomputed" in result else "RAG pipeline"
+        logger.info(f"Policy response from {source} for question: {question[:50]}...")
+        return jsonify(result)
+    except LLMCapacityError as e:
+        logger.warning(f"LLM capacity exhausted during YouTube policy query: {str(e)}")
+        return llm_capacity_response(e)
     except Exception as e:
-        logger.error(f"Error in YouTube policy query: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in YouTube policy query: {str(e)}")
         return jsonify({"error": "Failed to retrieve policy information"}), 500
 
 
@@ -305,10 +502,10 @@ def youtube_policy():
 def ama():
     """
     💬 Ask Me Anything - Get responses from Rohit's knowledge base
-    POST Data: { "question": "question for Rohit" }
-    Returns: JSON with personalized answer
+    POST Data: { "question": "question for Rohit", "session_id": "optional id from a previous answer" }
+    Returns: JSON with personalized answer, session_id for follow-ups, and prompt token counts
     
-    Improvement: Added enhanced logging and input validation
+    Improvement: Follow-ups reuse a server-side session whose prompt size stays bounded
     """
     try:
         data = request.get_json()
@@ -323,19 +520,37 @@ def ama():
             logger.warning("AMA query attempted with empty question")
             return jsonify({"error": "Question is required for AMA"}), 400
         
-        # 🧠 Get response from Rohit's knowledge base using semantic search
-        answer = process_legal_assistant_query(question)
+        # 🧠 Continue the conversation (unknown or expired ids start a new session)
+        session = ama_sessions.load(data.get("session_id"))
+        turn = process_legal_assistant_turn(question, session)
+        ama_sessions.save(session)
         
         # 🎨 Log successful processing
-        logger.info(f"AMA response generated for question: {question[:50]}...")
-        return jsonify({"answer": answer})
+        logger.info(f"AMA turn {session['turn_count']} answered in session {session['session_id']} "
+                    f"({turn['prompt_tokens']} prompt tokens): {question[:50]}...")
+        return jsonify(dict(turn, session_id=session["session_id"], turn=session["turn_count"]))
+    except LLMCapacityError as e:
+        logger.warning(f"LLM capacity exhausted during AMA query: {str(e)}")
+        return llm_capacity_response(e)
     except Exception as e:
-        logger.error(f"Error in AMA query: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error in AMA query: {str(e)}")
         return jsonify({"error": "Failed to generate response"}), 500
 
 
 
+@app.route("/api/ama/session/<session_id>", methods=["DELETE"])
+def end_ama_session(session_id):
+    """
+    🗑️ Forget an AMA conversation
+    Returns: JSON confirming deletion, or 404 if the session is unknown
+    """
+    if not ama_sessions.delete(session_id):
+        return jsonify({"error": "Session not found", "code": 404}), 404
+    logger.info(f"AMA session {session_id} deleted")
+    return jsonify({"deleted": session_id})
+
+
+
 
 @app.route("/api/health", methods=["GET"])
 def health_check():
@@ -368,20 +583,32 @@ def debug_info():
     # 🚨 Should be disabled in production environments
     # Security reminder: Ensure this endpoint is not exposed in production
     # 🎨 DEBUG: Debug information endpoint accessed
-    print("🔧 Debug information endpoint accessed")
+    logger.debug("Debug information endpoint accessed")
     
     return jsonify({
         "debug": True,
         "endpoints": [
             "/api/contract/simplify",
+            "/api/contract/upload",
             "/api/content/check", 
             "/api/invoice/generate",
             "/api/invoice/download",
             "/api/youtube/policy",
-            "/api/ama/ask"
+            "/api/ama/ask",
+            "/api/ama/session/<session_id>",
+            "/api/jobs",
+            "/api/jobs/<job_id>"
         ],
         "note": "Development debug endpoint",
-        "pdf_support": WEASYPRINT_AVAILABLE
+        "pdf_support": WEASYPRINT_AVAILABLE,
+        "compression": response_optimizer.snapshot(),
+        "admission": admission_controller.snapshot(),
+        "llm_scheduler": llm_scheduler.snapshot(),
+        "jobs": job_manager.snapshot(),
+        "vector_namespaces": namespaced_store.snapshot(),
+        "answer_index": answer_index.snapshot(),
+        "profiling": request_profiler.snapshot(),
+        "logging": request_logger.snapshot()
     })
 
 
@@ -400,10 +627,6 @@ def not_found(error):
     logger.warning(f"404 error: {request.url}")
     return jsonify({"error": "Endpoint not found", "code": 404}), 404
 
-    print("🚨 404 Error: Endpoint not found")
-
-    return jsonify({"error": "Endpoint not found", "code": 404}), 404
-
 
 @app.errorhandler(500)
 def internal_error(error):
@@ -415,8 +638,7 @@ def internal_error(error):
         JSON response with error details and 500 status code
     """
     # 🎯 Log internal server error with traceback
-    logger.error(f"500 error: {str(error)}")
-    logger.error(traceback.format_exc())
+    logger.exception(f"500 error: {str(error)}")
     
     # 🎯 TODO: Add error logging and monitoring integration
     # Enhancement: Integrate with Sentry or similar error tracking service
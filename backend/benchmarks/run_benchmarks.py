@@ -0,0 +1,505 @@
+"""
+End-to-End API Benchmark Suite for YouTube Legal Advisor AI Bot
+==============================================================
+
+Drives every /api endpoint over HTTP against local stand-ins for Groq and Ollama:
+- Starts fake_groq_server and fake_ollama_server in-process
+- Starts the Flask app as a subprocess (gunicorn gthread if installed, else the Flask server)
+- Runs each endpoint at a configurable concurrency and request count
+- Reports throughput, p50/p95/p99 latency, framework overhead (from Server-Timing),
+  server CPU time and peak RSS per endpoint
+- Writes machine-readable JSON and compares against a stored baseline
+
+Usage (from the backend directory):
+    python benchmarks/run_benchmarks.py --concurrency 8 --requests 200
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Exit status is 1 when any endpoint regresses beyond --tolerance versus the baseline.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+import fake_groq_server
+import fake_ollama_server
+
+# ==================== APPLICATION CONFIGURATION ====================
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results.json")
+DEFAULT_TOLERANCE = 0.25                  # Allowed relative regression before failing
+SERVER_STARTUP_TIMEOUT = 60               # Seconds to wait for the app to accept connections
+RSS_SAMPLE_INTERVAL = 0.05                # Seconds between server memory samples
+
+# "{reference}" is replaced per request so every clause is new to the clause cache and really analyzed
+SAMPLE_CONTRACT = (
+    "1. Term. This Sponsorship Agreement {reference} begins on the Effective Date and continues for twelve (12) months. "
+    "2. Exclusivity. Under agreement {reference} the Creator shall not promote competing brands in the same product category. "
+    "3. Compensation. The Brand shall pay INR 50,000 under agreement {reference} within thirty (30) days of each approved video. "
+    "4. Content Rights. The Creator grants the Brand a non-exclusive licence to reuse the content made under agreement {reference}. "
+    "5. Termination. Either party may terminate agreement {reference} with fourteen (14) days written notice. "
+) * 6
+REFERENCE_PLACEHOLDER = "{reference}"
+
+# Endpoint name -> (path, JSON payload)
+ENDPOINTS = {
+    "contract_simplify": ("/api/contract/simplify", {"text": SAMPLE_CONTRACT}),
+    "content_check": ("/api/content/check", {"text": "In this video I review a new phone and share my honest opinion about it."}),
+    "invoice_generate": ("/api/invoice/generate", {"brand": "Acme Audio", "service": "Dedicated review video", "amount": 50000, "include_gst": True}),
+    "invoice_download": ("/api/invoice/download", {"invoice_text": "PROFESSIONAL INVOICE\nClient/Brand: Acme Audio\nTotal Amount: INR 59000.00"}),
+    "youtube_policy": ("/api/youtube/policy", {"question": "Can I use copyrighted music in my videos?"}),
+    "ama_ask": ("/api/ama/ask", {"question": "What should I check before signing an exclusivity clause?"}),
+}
+
+
+# ==================== HELPER FUNCTIONS ====================
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def parse_server_timing(header):
+    """
+    ⏱️ Parse "model;dur=1.0, queue;dur=0.0, app;dur=2.0" into a dict of milliseconds
+    """
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, duration = part.strip().partition(";dur=")
+        if duration:
+            timings[name] = float(duration)
+    return timings
+
+
+# ==================== SERVER PROCESS MONITORING ====================
+def process_tree(pid):
+    """
+    🌳 Return pid and all descendant pids (Linux /proc only)
+    """
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        task_dir = f"/proc/{current}/task"
+        if not os.path.isdir(task_dir):
+            continue
+        for task in os.listdir(task_dir):
+            try:
+                with open(f"{task_dir}/{task}/children") as children:
+                    pending.extend(int(child) for child in children.read().split())
+            except OSError:
+                continue
+    return pids
+
+
+def cpu_seconds(pid):
+    """
+    🧮 Total user+system CPU seconds of a process tree, or None if unavailable
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/stat") as stat:
+                fields = stat.read().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / ticks
+
+
+def rss_bytes(pid):
+    """
+    💾 Resident memory of a process tree in bytes, or None if unavailable
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    total = 0
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/statm") as statm:
+                total += int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class RssSampler:
+    """
+    📈 Background sampler recording peak RSS of the server while a phase runs
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes(self.pid) or 0)
+            self._stop.wait(RSS_SAMPLE_INTERVAL)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+# ==================== STAND-IN SERVICES ====================
+def start_stand_ins(args):
+    """
+    🤖 Start fake Groq and Ollama servers on background threads
+
+    Returns:
+        tuple: (environment overrides for the app, list of servers to shut down)
+    """
+    groq_port, ollama_port = free_port(), free_port()
+    groq = fake_groq_server.create_server(
+        groq_port, requests_per_minute=10**9, tokens_per_minute=10**12,
+        latency=args.llm_latency, requests_per_day=10**12,
+    )
+    ollama = fake_ollama_server.create_server(ollama_port, latency=args.embed_latency)
+    for server in (groq, ollama):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = {
+        "GROQ_API_KEY": "benchmark",
+        "GROQ_API_BASE": f"http://127.0.0.1:{groq_port}",
+        "OLLAMA_HOST": f"http://127.0.0.1:{ollama_port}",
+        "LLM_BACKEND": "groq",
+        "EMBEDDINGS_BACKEND": "ollama",
+        # 🎯 Measure the hot path, not the protective limits
+        "GROQ_REQUESTS_PER_MINUTE": str(10**9),
+        "GROQ_TOKENS_PER_MINUTE": str(10**12),
+        "ADMISSION_FAST_CONCURRENCY": str(max(args.concurrency, 16)),
+        "ADMISSION_SLOW_CONCURRENCY": str(args.concurrency),
+        "ADMISSION_FAST_QUEUE": str(args.concurrency * 4),
+        "ADMISSION_SLOW_QUEUE": str(args.concurrency * 4),
+    }
+    return env, [groq, ollama]
+
+
+def start_app(args, env_overrides):
+    """
+    🚀 Launch the Flask app in a subprocess and wait until it accepts connections
+
+    Returns:
+        tuple: (subprocess.Popen, port)
+    """
+    port = free_port()
+    env = dict(os.environ, **env_overrides)
+    threads = str(max(args.concurrency, 4))
+    if shutil.which("gunicorn") and args.server == "gunicorn":
+        command = ["gunicorn", "app:app", "--worker-class", "gthread", "--workers", "1",
+                   "--threads", threads, "--bind", f"127.0.0.1:{port}", "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-c",
+                   f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"]
+
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("App did not start listening in time")
+
+
+# ==================== LOAD GENERATION ====================
+class Client:
+    """
+    🔌 Keep-alive HTTP client, one connection per worker thread
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def post(self, path, body):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=120)
+            with self._lock:
+                self._connections.append(connection)
+        started = time.perf_counter()
+        try:
+            connection.request("POST", path, body=body, headers={
+                "Content-Type": "application/json", "Accept-Encoding": "gzip, br",
+            })
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            return time.perf_counter() - started, 0, {}
+        elapsed = time.perf_counter() - started
+        return elapsed, response.status, parse_server_timing(response.getheader("Server-Timing"))
+
+    def close(self):
+        """
+        🔒 Close every worker thread's keep-alive connection, so the server can stop promptly
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+
+def request_bodies(payload, count):
+    """
+    📦 Encode the payload once per request, filling in a unique reference where the payload has one
+    """
+    body = json.dumps(payload)
+    if REFERENCE_PLACEHOLDER not in body:
+        return [body.encode("utf-8")] * count
+    run = uuid.uuid4().hex[:8]
+    return [body.replace(REFERENCE_PLACEHOLDER, f"REF-{run}-{number}").encode("utf-8") for number in range(count)]
+
+
+def run_endpoint(client, server_pid, path, payload, args):
+    """
+    🏁 Benchmark one endpoint and return its summary metrics
+    """
+    bodies = request_bodies(payload, args.warmup + args.requests)
+    for body in bodies[:args.warmup]:
+        client.post(path, body)
+    bodies = bodies[args.warmup:]
+
+    cpu_before = cpu_seconds(server_pid)
+    with RssSampler(server_pid) as sampler, ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        started = time.perf_counter()
+        samples = list(pool.map(lambda body: client.post(path, body), bodies))
+        wall = time.perf_counter() - started
+    cpu_after = cpu_seconds(server_pid)
+
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    overheads = sorted(sample[2].get("app", 0.0) for sample in samples if sample[2])
+    model_times = sorted(sample[2].get("model", 0.0) for sample in samples if sample[2])
+    queue_times = sorted(sample[2].get("queue", 0.0) for sample in samples if sample[2])
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    successes = statuses.get("200", 0)
+    cpu_used = (cpu_after - cpu_before) if cpu_before is not None and cpu_after is not None else None
+
+    summary = {
+        "requests": len(samples),
+        "statuses": statuses,
+        "error_rate": round(1 - successes / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(successes / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        },
+        "app_overhead_ms": {
+            "p50": round(percentile(overheads, 0.50), 2),
+            "p95": round(percentile(overheads, 0.95), 2),
+        },
+        "model_ms_p50": round(percentile(model_times, 0.50), 2),
+        "queue_ms_p50": round(percentile(queue_times, 0.50), 2),
+        "cpu_seconds": round(cpu_used, 3) if cpu_used is not None else None,
+        "cpu_ms_per_request": round(cpu_used * 1000 / len(samples), 3) if cpu_used is not None and samples else None,
+        "rss_peak_mb": round(sampler.peak / 2**20, 1) if sampler.peak else None,
+    }
+    if not successes:
+        # 🚫 Nothing succeeded (e.g. PDF download without WeasyPrint): the numbers measure error paths only
+        summary["skipped"] = f"endpoint unavailable, no request succeeded (statuses {statuses})"
+    return summary
+
+
+# ==================== BASELINE COMPARISON ====================
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    ⚖️ List regressions of p95 latency, framework overhead and throughput beyond tolerance
+
+    Returns:
+        list: Human-readable regression descriptions (empty when within tolerance)
+    """
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if current.get("skipped") or previous.get("skipped"):
+            if current.get("skipped") and not previous.get("skipped"):
+                regressions.append(f"{name}: {current['skipped']}")
+            continue
+        checks = [
+            ("p95 latency", current["latency_ms"]["p95"], previous["latency_ms"]["p95"], True),
+            ("p95 app overhead", current["app_overhead_ms"]["p95"], previous["app_overhead_ms"]["p95"], True),
+            ("throughput", current["throughput_rps"], previous["throughput_rps"], False),
+        ]
+        for label, now, before, lower_is_better in checks:
+            if not before:
+                continue
+            change = (now - before) / before
+            if (lower_is_better and change > tolerance) or (not lower_is_better and -change > tolerance):
+                regressions.append(f"{name}: {label} {before} -> {now} ({change:+.0%})")
+        if current["error_rate"] > previous.get("error_rate", 0.0):
+            regressions.append(f"{name}: error rate {previous.get('error_rate', 0.0)} -> {current['error_rate']}")
+    return regressions
+
+
+def endpoint_errors(results):
+    """
+    🚨 List measured endpoints that answered some requests with errors
+
+    Skipped endpoints are reported by print_report() instead; any other non-200
+    response fails the run, since its latency and throughput mix in error paths.
+    """
+    return [
+        f"{name}: error rate {metrics['error_rate']} (statuses {metrics['statuses']})"
+        for name, metrics in results["endpoints"].items()
+        if metrics["error_rate"] and not metrics.get("skipped")
+    ]
+
+
+def print_report(results):
+    header = f"{'endpoint':<20}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'app p50':>10}{'queue p50':>11}{'cpu ms/req':>12}{'rss MB':>9}  statuses"
+    print(header)
+    print("-" * len(header))
+    for name, metrics in results["endpoints"].items():
+        latency = metrics["latency_ms"]
+        print(f"{name:<20}{metrics['throughput_rps']:>9}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+              f"{metrics['app_overhead_ms']['p50']:>10}{metrics['queue_ms_p50']:>11}{str(metrics['cpu_ms_per_request']):>12}"
+              f"{str(metrics['rss_peak_mb']):>9}  {metrics['statuses']}")
+    for name, metrics in results["endpoints"].items():
+        if metrics.get("skipped"):
+            print(f"⚠️  Skipped {name}: {metrics['skipped']}")
+
+
+# ==================== MAIN EXECUTION BLOCK ====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all /api endpoints against local Groq/Ollama stand-ins")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint")
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake Groq seconds per completion")
+    parser.add_argument("--embed-latency", type=float, default=0.005, help="Fake Ollama seconds per embedding call")
+    parser.add_argument("--server", choices=["gunicorn", "flask"], default="gunicorn")
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--verbose", action="store_true", help="Show app server logs")
+    args = parser.parse_args(argv)
+
+    env_overrides, stand_ins = start_stand_ins(args)
+
+    # 🗄️ Fresh caches and stores per run, so earlier runs' clause analyses and answers are never reused
+    state_dir = tempfile.mkdtemp(prefix="benchmark-state-")
+    env_overrides.update({
+        "CLAUSE_CACHE_PATH": os.path.join(state_dir, "clause_cache.sqlite3"),
+        "ANSWER_INDEX_PATH": os.path.join(state_dir, "answer_index.sqlite3"),
+        "JOB_DB_PATH": os.path.join(state_dir, "jobs.sqlite3"),
+        "AMA_SESSION_PATH": os.path.join(state_dir, "ama_sessions.sqlite3"),
+    })
+    process, port = start_app(args, env_overrides)
+    client = Client(port)
+    try:
+        results = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "server": args.server if shutil.which("gunicorn") else "flask",
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "llm_latency": args.llm_latency,
+                "embed_latency": args.embed_latency,
+            },
+            "endpoints": {},
+        }
+        for name in args.endpoints:
+            path, payload = ENDPOINTS[name]
+            print(f"⏱️  Benchmarking {name} ({path})...")
+            results["endpoints"][name] = run_endpoint(client, process.pid, path, payload, args)
+
+        # 📝 Written before teardown, so a slow server shutdown can never lose the run
+        print_report(results)
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"\n📝 Results written to {args.output}")
+    finally:
+        client.close()
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        for server in stand_ins:
+            server.shutdown()
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    errors = endpoint_errors(results)
+    if errors:
+        print("\n❌ Endpoints returned errors:")
+        for error in errors:
+            print(f"   - {error}")
+        return 1
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"📌 Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️  No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        regressions = compare_to_baseline(results, json.load(baseline_file), args.tolerance)
+    if regressions:
+        print(f"\n❌ Regressions beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print(f"\n✅ Within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Vector Shard Scaling Benchmark for YouTube Legal Advisor AI Bot
+==============================================================
+
+Measures how sharded vector search scales with the number of shard processes:
+- Builds a synthetic FAISS store (random vectors spread over the three namespaces)
+- Searches it in-process with NamespacedVectorStore as the reference
+- For each shard count: splits the store, starts one serve process per shard,
+  and runs the same queries through ShardedVectorClient
+- Reports throughput, p50/p95 latency and resident memory per shard, and checks
+  that sharded results match the in-process ones
+
+Query vectors are passed in directly, so embedding time is not part of the numbers.
+Speed-ups need as many free cores as shards; on a single core the extra processes
+only add RPC overhead, while per-process memory still drops with every shard.
+
+Usage (from the backend directory):
+    python benchmarks/shard_scaling.py --vectors 200000 --shards 1 2 4 8
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+import faiss
+import numpy as np
+from vector_namespaces import NAMESPACES, NamespacedVectorStore
+from vector_shards import ShardedVectorClient, split_store, start_local_shards
+
+
+# ==================== HELPER FUNCTIONS ====================
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def build_store(vectors, dimension, seed=7):
+    """
+    🏗️ Synthetic flat L2 store with chunks dealt across the namespaces
+    """
+    rng = np.random.default_rng(seed)
+    index = faiss.IndexFlatL2(dimension)
+    index.add(rng.standard_normal((vectors, dimension), dtype=np.float32))
+    documents = {
+        str(position): Document(page_content=f"chunk {position}",
+                                metadata={"namespace": NAMESPACES[position % len(NAMESPACES)]})
+        for position in range(vectors)
+    }
+    return FAISS(None, index, InMemoryDocstore(documents), {position: str(position) for position in range(vectors)})
+
+
+def run_queries(search, queries, concurrency):
+    """
+    ⏱️ Run every query through search() at the given concurrency
+
+    Returns:
+        dict: Throughput and latency percentiles
+    """
+    def timed(vector):
+        started = time.perf_counter()
+        search(vector)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, queries))
+    elapsed = time.perf_counter() - started
+    return {
+        "qps": round(len(queries) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+    }
+
+
+def result_ids(hits):
+    return [document.page_content for document, _ in hits]
+
+
+# ==================== MAIN ====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sharded vector search from 1 to N shard processes")
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--base-port", type=int, default=7600)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    authkey = secrets.token_hex(16)
+    os.environ["VECTOR_SHARD_AUTHKEY"] = authkey            # Inherited by the shard processes
+
+    print(f"Building {args.vectors} x {args.dimension} store...", flush=True)
+    store = build_store(args.vectors, args.dimension)
+    rng = np.random.default_rng(11)
+    queries = [rng.standard_normal((1, args.dimension), dtype=np.float32) for _ in range(args.queries)]
+
+    local = NamespacedVectorStore(store)
+    search_local = lambda vector: local.search_with_scores(None, NAMESPACES, args.k, query_vector=vector)
+    run_queries(search_local, queries[:20], args.concurrency)
+    results = {"in_process": {**run_queries(search_local, queries, args.concurrency),
+                              "rss_mb": round(rss_mb(os.getpid()) or 0, 1)}}
+    expected = [result_ids(search_local(vector)) for vector in queries[:20]]
+
+    with tempfile.TemporaryDirectory() as workspace:
+        for run, shards in enumerate(args.shards):
+            shard_dir = os.path.join(workspace, f"split-{shards}")
+            split_store(store, shards, shard_dir, source_version="benchmark")
+            base_port = args.base_port + 100 * run
+            processes = start_local_shards(shards, shard_dir, base_port=base_port)
+            try:
+                client = ShardedVectorClient(None, addresses=[f"127.0.0.1:{base_port + shard}" for shard in range(shards)],
+                                             authkey=authkey, timeout=60, startup_timeout=300)
+                search_sharded = lambda vector: client.search_with_scores(None, NAMESPACES, args.k, query_vector=vector)
+                matches = all(result_ids(search_sharded(vector)) == ids for vector, ids in zip(queries, expected))
+                run_queries(search_sharded, queries[:20], args.concurrency)
+                metrics = run_queries(search_sharded, queries, args.concurrency)
+                shard_rss = [rss_mb(process.pid) or 0 for process in processes]
+                results[f"{shards}_shards"] = {**metrics, "rss_mb_per_shard": round(max(shard_rss), 1),
+                                               "rss_mb_total": round(sum(shard_rss), 1), "matches_in_process": matches}
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait()
+
+    print(f"\n{'configuration':<16}{'qps':>9}{'p50 ms':>10}{'p95 ms':>10}{'rss MB/shard':>14}{'rss MB total':>14}  match")
+    for name, metrics in results.items():
+        print(f"{name:<16}{metrics['qps']:>9}{metrics['p50_ms']:>10}{metrics['p95_ms']:>10}"
+              f"{str(metrics.get('rss_mb_per_shard', '-')):>14}{str(metrics.get('rss_mb_total', metrics.get('rss_mb'))):>14}"
+              f"  {metrics.get('matches_in_process', '-')}")
+    print(f"\n{os.cpu_count()} CPUs, {args.vectors} vectors x {args.dimension} dims, k={args.k}, concurrency {args.concurrency}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"cpus": os.cpu_count(), "args": vars(args), "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
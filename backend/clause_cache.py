@@ -0,0 +1,154 @@
+"""
+Clause-Level Analysis Cache for YouTube Legal Advisor AI Bot
+===========================================================
+
+Creators resubmit whole contracts after every negotiation round. This module
+lets the contract pipeline re-analyze only what changed:
+- Segments a contract into clauses (numbered headings, "Section"/"Article"/"Clause"
+  headings, or paragraphs as a fallback)
+- Hashes each clause body with its numbering stripped, so renumbering after an
+  inserted clause does not invalidate the rest
+- Stores per-clause LLM analyses in a persistent local SQLite cache
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# ==================== APPLICATION CONFIGURATION ====================
+CLAUSE_CACHE_PATH = os.getenv("CLAUSE_CACHE_PATH", "cache/clause_cache.sqlite3")
+CLAUSE_CACHE_MAX_ENTRIES = int(os.getenv("CLAUSE_CACHE_MAX_ENTRIES", "50000"))
+MIN_CLAUSE_CHARACTERS = 40                  # Shorter fragments are merged into the previous clause
+PRUNE_EVERY_WRITES = 500                    # How often to enforce CLAUSE_CACHE_MAX_ENTRIES
+
+# A clause starts with an enumerator and a capitalised word, either at a line start ("1.2 Term")
+# or mid-line after a sentence end ("... months. 2. Exclusivity"), where a trailing "." or ")" is required
+_HEADING_WORD = r"(?i:section|article|clause)\s+[\dIVXLC]+[.:]?"
+_CLAUSE_BOUNDARY = re.compile(
+    r"(?<=\n)(?=[ \t]*(?:\d+(?:\.\d+)*[.)]?|" + _HEADING_WORD + r")\s+[A-Z\"'(])"
+    r"|(?<=[.;:] )(?=(?:\d+(?:\.\d+)*[.)]|" + _HEADING_WORD + r")\s+[A-Z\"'(])",
+)
+_ENUMERATOR = re.compile(r"^\s*((?:section|article|clause)\s+[\dIVXLC]+|\d+(?:\.\d+)*)[.):]?\s+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+# ==================== CLAUSE SEGMENTATION ====================
+def segment_clauses(contract_text):
+    """
+    ✂️ Split a contract into clauses with stable content hashes
+
+    Args:
+        contract_text (str): Full contract text
+
+    Returns:
+        list: One dict per clause with "label" (e.g. "1.2" or ""), "text" (body
+              without its enumerator) and "hash" (SHA-256 of the normalised body)
+    """
+    parts = _CLAUSE_BOUNDARY.split(contract_text)
+    if len(parts) < 2:
+        parts = re.split(r"\n\s*\n", contract_text)
+
+    clauses = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        if clauses and len(part) < MIN_CLAUSE_CHARACTERS:
+            clauses[-1]["raw"] += " " + part
+            continue
+        clauses.append({"raw": part})
+
+    for clause in clauses:
+        raw = clause.pop("raw")
+        match = _ENUMERATOR.match(raw)
+        clause["label"] = match.group(1) if match else ""
+        clause["text"] = raw[match.end():] if match else raw
+        normalised = _WHITESPACE.sub(" ", clause["text"]).strip()
+        clause["hash"] = hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+    return clauses
+
+
+# ==================== PERSISTENT CACHE ====================
+class ClauseCache:
+    """
+    🗄️ SQLite-backed map from (clause hash, analysis version) to analysis text
+
+    Args:
+        path (str): SQLite database file; parent directories are created
+        version (str): Prompt/model identifier; changing it invalidates old entries
+    """
+
+    def __init__(self, path=CLAUSE_CACHE_PATH, version="v1"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.version = version
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS clause_analyses ("
+            " clause_hash TEXT NOT NULL, version TEXT NOT NULL, analysis TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (clause_hash, version))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_clause_last_used ON clause_analyses (last_used)")
+        self._connection.commit()
+
+    def get_many(self, clause_hashes):
+        """
+        🔍 Look up cached analyses
+
+        Args:
+            clause_hashes (list): Clause hashes to fetch
+
+        Returns:
+            dict: clause hash -> analysis for every hit
+        """
+        unique = list(dict.fromkeys(clause_hashes))
+        if not unique:
+            return {}
+        placeholders = ",".join("?" * len(unique))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT clause_hash, analysis FROM clause_analyses WHERE version = ? AND clause_hash IN ({placeholders})",
+                [self.version, *unique],
+            ).fetchall()
+            if rows:
+                self._connection.execute(
+                    f"UPDATE clause_analyses SET last_used = ? WHERE version = ? AND clause_hash IN ({placeholders})",
+                    [time.time(), self.version, *unique],
+                )
+                self._connection.commit()
+        return dict(rows)
+
+    def put(self, clause_hash, analysis):
+        """
+        💾 Store one clause analysis
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO clause_analyses VALUES (?, ?, ?, ?, ?)",
+                (clause_hash, self.version, analysis, now, now),
+            )
+            self._connection.commit()
+            self._writes += 1
+            if self._writes % PRUNE_EVERY_WRITES == 0:
+                self._prune()
+
+    def _prune(self):
+        """
+        🧹 Evict least-recently-used entries beyond CLAUSE_CACHE_MAX_ENTRIES (caller holds the lock)
+        """
+        self._connection.execute(
+            "DELETE FROM clause_analyses WHERE rowid IN ("
+            " SELECT rowid FROM clause_analyses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (CLAUSE_CACHE_MAX_ENTRIES,),
+        )
+        self._connection.commit()
@@ -0,0 +1,266 @@
+"""
+Contract File Extraction for YouTube Legal Advisor AI Bot
+========================================================
+
+This module turns uploaded contract files into clean prompt text:
+- Streams multipart uploads straight to a temporary file (never fully in memory)
+- Extracts PDF text page-by-page across a reusable process pool
+- Drops boilerplate: repeated headers/footers and bare page numbers
+- Enforces size, page-count and time limits and reports extraction timing
+
+Plain-text uploads (.txt) are decoded directly without the process pool.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import Request
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+
+# ==================== APPLICATION CONFIGURATION ====================
+CONTRACT_UPLOAD_MAX_BYTES = int(os.getenv("CONTRACT_UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))   # 20 MB
+CONTRACT_REQUEST_MAX_BYTES = CONTRACT_UPLOAD_MAX_BYTES + 64 * 1024                             # Room for multipart headers and form fields
+CONTRACT_MAX_PAGES = int(os.getenv("CONTRACT_MAX_PAGES", "200"))
+CONTRACT_MAX_CHARACTERS = int(os.getenv("CONTRACT_MAX_CHARACTERS", "200000"))                  # Text sent to the LLM
+EXTRACTION_TIMEOUT = float(os.getenv("CONTRACT_EXTRACTION_TIMEOUT", "30"))                     # Seconds for all pages
+EXTRACTION_WORKERS = int(os.getenv("CONTRACT_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARALLEL_PAGE_THRESHOLD = 8                 # Smaller PDFs are extracted by one pool task; splitting would cost more IPC than it saves
+BOILERPLATE_EDGE_LINES = 3                  # Lines at the top/bottom of each page checked for headers/footers
+BOILERPLATE_MIN_PAGE_SHARE = 0.5            # A line on at least this share of pages is treated as boilerplate
+
+_PAGE_NUMBER_LINE = re.compile(r"^[\s\-–—|]*(page\s*)?\d+(\s*(of|/)\s*\d+)?[\s\-–—|]*$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ==================== EXCEPTIONS ====================
+class ContractExtractionError(Exception):
+    """
+    📄 Raised when an uploaded contract cannot be read within the configured limits
+
+    Args:
+        message (str): User-facing explanation
+        status_code (int): HTTP status the API should return
+    """
+
+    def __init__(self, message, status_code=422):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# ==================== STREAMING UPLOADS ====================
+class StreamedUploadRequest(Request):
+    """
+    📥 Request class that writes every uploaded file straight to a named temp file
+
+    Werkzeug's default keeps uploads under 500 KB in memory; a named file on disk
+    lets extraction worker processes open the upload by path instead.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.NamedTemporaryFile("w+b", prefix="contract-upload-", suffix=".part")
+
+
+# ==================== PROCESS POOL ====================
+def _get_pool():
+    """
+    🏊 Lazily create the shared extraction pool (spawned, so it is safe in threaded servers)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool(terminate=False):
+    """
+    ♻️ Drop the pool so the next upload starts fresh workers
+
+    Args:
+        terminate (bool): Kill the worker processes too. Needed after a timeout:
+            a running extraction cannot be cancelled and would keep its worker busy
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            if terminate:
+                # ProcessPoolExecutor has no public way to stop running tasks (before Python 3.14)
+                for process in list((_pool._processes or {}).values()):
+                    process.terminate()
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _extract_page_range(path, start, end):
+    """
+    📃 Extract text for pages [start, end) of a PDF (runs in a worker process)
+    """
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return [(page.extract_text() or "") for page in pdf.pages[start:end]]
+
+
+def _count_pages(path):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+# ==================== BOILERPLATE REMOVAL ====================
+def remove_boilerplate(pages):
+    """
+    🧹 Drop repeated headers/footers and bare page-number lines
+
+    A line near the top or bottom of a page is boilerplate when the same line
+    (with digits normalised, so "Page 3 of 9" matches "Page 4 of 9") appears
+    on at least half of the pages and never in the middle of a page. Page-number
+    lines ("7", "Page 7 of 9") are only dropped as a page's first or last line, so
+    clause numbers and years standing on their own line inside the text are kept.
+
+    Args:
+        pages (list): Text of each page
+
+    Returns:
+        tuple: (cleaned text, number of lines removed)
+    """
+    def signature(line):
+        return _DIGITS.sub("#", line.strip().lower())
+
+    page_lines = [page.splitlines() for page in pages]
+    edge_counts, body_signatures = {}, set()
+    for lines in page_lines:
+        edges = {signature(line) for line in lines[:BOILERPLATE_EDGE_LINES] + lines[-BOILERPLATE_EDGE_LINES:] if line.strip()}
+        for edge in edges:
+            edge_counts[edge] = edge_counts.get(edge, 0) + 1
+        body_signatures.update(signature(line) for line in lines[BOILERPLATE_EDGE_LINES:-BOILERPLATE_EDGE_LINES])
+
+    # 🎯 Lines that also occur mid-page are content (e.g. numbered clauses), not running headers
+    repeated = set()
+    if len(pages) > 1:
+        repeated = {edge for edge, count in edge_counts.items()
+                    if count / len(pages) >= BOILERPLATE_MIN_PAGE_SHARE and edge not in body_signatures}
+
+    kept_pages, removed = [], 0
+    for lines in page_lines:
+        kept = []
+        text_lines = [index for index, line in enumerate(lines) if line.strip()]
+        outer_lines = {text_lines[0], text_lines[-1]} if text_lines else set()
+        for index, line in enumerate(lines):
+            near_edge = index < BOILERPLATE_EDGE_LINES or index >= len(lines) - BOILERPLATE_EDGE_LINES
+            page_number = index in outer_lines and _PAGE_NUMBER_LINE.match(line.strip())
+            if page_number or (near_edge and signature(line) in repeated):
+                removed += 1
+                continue
+            kept.append(line)
+        kept_pages.append("\n".join(kept).strip())
+    return "\n\n".join(page for page in kept_pages if page), removed
+
+
+# ==================== EXTRACTION ENTRY POINTS ====================
+def _collect(futures, deadline):
+    """
+    ⏳ Wait for pool tasks until the shared deadline, mapping failures to ContractExtractionError
+
+    Returns:
+        list: Each future's result, in order
+    """
+    try:
+        return [future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures]
+    except FutureTimeoutError as error:
+        _reset_pool(terminate=True)
+        raise ContractExtractionError("PDF text extraction timed out", 504) from error
+    except BrokenProcessPool as error:
+        _reset_pool()
+        raise ContractExtractionError("PDF text extraction worker crashed", 500) from error
+    except Exception as error:
+        raise ContractExtractionError(f"Could not read PDF: {error}") from error
+
+
+def extract_pdf_pages(path):
+    """
+    📚 Extract every page of a PDF, in parallel for larger documents
+
+    All parsing, including the page count, runs in the process pool under one
+    CONTRACT_EXTRACTION_TIMEOUT deadline, so a malformed PDF of any size cannot
+    hold the request thread longer than that.
+
+    Args:
+        path (str): Path of the PDF on disk
+
+    Returns:
+        list: Text of each page, in order
+
+    Raises:
+        ContractExtractionError: If the PDF is unreadable, too long or too slow
+    """
+    deadline = time.monotonic() + EXTRACTION_TIMEOUT
+    pool = _get_pool()
+    page_count, = _collect([pool.submit(_count_pages, path)], deadline)
+    if page_count > CONTRACT_MAX_PAGES:
+        raise ContractExtractionError(f"PDF has {page_count} pages; the limit is {CONTRACT_MAX_PAGES}", 413)
+
+    chunk = page_count
+    if page_count >= PARALLEL_PAGE_THRESHOLD and EXTRACTION_WORKERS > 1:
+        chunk = -(-page_count // EXTRACTION_WORKERS)
+    pool = _get_pool()                      # A timed-out upload on another thread may have replaced it
+    futures = [pool.submit(_extract_page_range, path, start, min(start + chunk, page_count))
+               for start in range(0, page_count, max(1, chunk))]
+    return [page for pages in _collect(futures, deadline) for page in pages]
+
+
+def extract_uploaded_contract(upload):
+    """
+    📄 Turn an uploaded contract file into cleaned text plus extraction stats
+
+    Args:
+        upload (FileStorage): File from request.files, backed by a temp file
+
+    Returns:
+        tuple: (text, stats dict with pages, upload_bytes, characters,
+                boilerplate_lines_removed, truncated, extract_ms)
+
+    Raises:
+        ContractExtractionError: For unsupported, oversized or unreadable files
+    """
+    started = time.perf_counter()
+    upload.stream.seek(0, os.SEEK_END)
+    upload_bytes = upload.stream.tell()
+    upload.stream.seek(0)
+    if upload_bytes == 0:
+        raise ContractExtractionError("Uploaded file is empty", 400)
+    if upload_bytes > CONTRACT_UPLOAD_MAX_BYTES:
+        raise ContractExtractionError("Uploaded file is too large", 413)
+
+    filename = (upload.filename or "").lower()
+    if filename.endswith(".pdf") or upload.mimetype == "application/pdf":
+        upload.stream.flush()
+        pages = extract_pdf_pages(upload.stream.name)
+    elif filename.endswith(".txt") or upload.mimetype == "text/plain":
+        pages = [upload.stream.read().decode("utf-8", errors="replace")]
+    else:
+        raise ContractExtractionError("Only PDF and plain-text contracts are supported", 415)
+
+    text, removed = remove_boilerplate(pages)
+    truncated = len(text) > CONTRACT_MAX_CHARACTERS
+    text = text[:CONTRACT_MAX_CHARACTERS]
+    return text, {
+        "pages": len(pages),
+        "upload_bytes": upload_bytes,
+        "characters": len(text),
+        "boilerplate_lines_removed": removed,
+        "truncated": truncated,
+        "extract_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,226 @@
+"""
+Local Fake Groq Server for YouTube Legal Advisor AI Bot
+=======================================================
+
+A stand-in for Groq's OpenAI-compatible chat completions API, used to exercise
+the outbound rate-limit scheduler and to run the backend without a real key:
+- POST /openai/v1/chat/completions returns a canned completion
+- Enforces rolling per-minute request and token limits
+- Emits realistic x-ratelimit-* headers, and 429 + retry-after when over budget
+
+Usage:
+    python fake_groq_server.py --port 8081 --rpm 30 --tpm 6000 --latency 0.2
+    GROQ_API_BASE=http://127.0.0.1:8081 python app.py
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import deque
+import argparse
+import json
+import math
+import re
+import threading
+import time
+import uuid
+
+# ==================== APPLICATION CONFIGURATION ====================
+DEFAULT_PORT = 8081
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_REQUESTS_PER_DAY = 14400
+DEFAULT_TOKENS_PER_MINUTE = 6000
+DEFAULT_LATENCY = 0.2                     # Seconds of simulated model time per completion
+COMPLETION_TEXT = "This is a simulated response from the local fake Groq server."
+CHARS_PER_TOKEN = 4
+CLAUSE_MARKER_PATTERN = re.compile(r"\[\[CLAUSE \d+\]\]")
+
+
+# ==================== RATE LIMIT STATE ====================
+class RollingLimits:
+    """
+    📏 Sliding one-minute windows of requests and tokens, like Groq's limiter
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, requests_per_day):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_day = requests_per_day
+        self.requests_today = 0
+        self._requests = deque()
+        self._tokens = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._requests and now - self._requests[0] >= 60:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= 60:
+            self._tokens.popleft()
+
+    def admit(self, tokens):
+        """
+        🎟️ Record a request if it fits the budget
+
+        Returns:
+            tuple: (admitted, headers) where headers are the x-ratelimit-* values to send
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            used_tokens = sum(amount for _, amount in self._tokens)
+            admitted = (
+                len(self._requests) < self.requests_per_minute
+                and used_tokens + tokens <= self.tokens_per_minute
+                and self.requests_today < self.requests_per_day
+            )
+            if admitted:
+                self._requests.append(now)
+                self._tokens.append((now, tokens))
+                self.requests_today += 1
+                used_tokens += tokens
+
+            headers = {
+                "x-ratelimit-limit-requests": str(self.requests_per_day),
+                "x-ratelimit-limit-tokens": str(self.tokens_per_minute),
+                "x-ratelimit-remaining-requests": str(max(0, self.requests_per_day - self.requests_today)),
+                "x-ratelimit-remaining-tokens": str(max(0, self.tokens_per_minute - used_tokens)),
+                "x-ratelimit-reset-requests": _format_duration(86400 * self.requests_today / self.requests_per_day),
+                "x-ratelimit-reset-tokens": _format_duration(self._token_reset(now, tokens)),
+            }
+            if not admitted:
+                request_reset = 60 - (now - self._requests[0]) if len(self._requests) >= self.requests_per_minute else 0
+                headers["retry-after"] = str(max(1, math.ceil(max(request_reset, self._token_reset(now, tokens)))))
+            return admitted, headers
+
+    def _token_reset(self, now, needed):
+        """
+        ⏱️ Seconds until enough of the token window expires to fit `needed`
+        """
+        used = sum(amount for _, amount in self._tokens)
+        if used + needed <= self.tokens_per_minute:
+            return 0.0
+        for stamp, amount in self._tokens:
+            used -= amount
+            if used + needed <= self.tokens_per_minute:
+                return 60 - (now - stamp)
+        return 60.0
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(max(0.0, seconds), 60)
+    if minutes:
+        return f"{int(minutes)}m{seconds:.2f}s"
+    return f"{seconds:.2f}s"
+
+
+def _completion_text(messages):
+    """
+    🏷️ Reply with one section per clause marker in the prompt, as a model following
+    the batched clause analysis template does; other prompts get COMPLETION_TEXT
+    """
+    text = "".join(str(message.get("content", "")) for message in messages)
+    markers = list(dict.fromkeys(CLAUSE_MARKER_PATTERN.findall(text)))
+    if not markers:
+        return COMPLETION_TEXT
+    return "\n\n".join(f"{marker}\n{COMPLETION_TEXT}" for marker in markers)
+
+
+def _count_prompt_tokens(messages):
+    text = "".join(str(message.get("content", "")) for message in messages)
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+# ==================== HTTP HANDLER ====================
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """
+    🤖 Serve OpenAI-compatible chat completions with Groq rate-limit headers
+    """
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16                    # Send headers and body in one write (avoids delayed-ACK stalls)
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/openai/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Unknown endpoint", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        prompt_tokens = _count_prompt_tokens(payload.get("messages", []))
+        completion_text = _completion_text(payload.get("messages", []))
+        completion_tokens = math.ceil(len(completion_text) / CHARS_PER_TOKEN)
+
+        admitted, headers = self.server.limits.admit(prompt_tokens + completion_tokens)
+        if not admitted:
+            self._send_json(429, {"error": {
+                "message": "Rate limit reached. Please try again later.",
+                "type": "tokens",
+                "code": "rate_limit_exceeded",
+            }}, headers)
+            return
+
+        time.sleep(self.server.latency)
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion_text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }, headers)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 🔇 Keep the console quiet under load; the client side reports results
+        pass
+
+
+# ==================== SERVER LIFECYCLE ====================
+def create_server(port=DEFAULT_PORT, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                  tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, latency=DEFAULT_LATENCY,
+                  requests_per_day=DEFAULT_REQUESTS_PER_DAY, host="127.0.0.1"):
+    """
+    🏗️ Build a fake Groq server (call serve_forever() or start it in a thread)
+
+    Returns:
+        ThreadingHTTPServer: Server with `limits` and `latency` attributes
+    """
+    server = ThreadingHTTPServer((host, port), FakeGroqHandler)
+    server.daemon_threads = True
+    server.limits = RollingLimits(requests_per_minute, tokens_per_minute, requests_per_day)
+    server.latency = latency
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake Groq chat completions server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rpm", type=int, default=DEFAULT_REQUESTS_PER_MINUTE, help="Requests per minute")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TOKENS_PER_MINUTE, help="Tokens per minute")
+    parser.add_argument("--rpd", type=int, default=DEFAULT_REQUESTS_PER_DAY, help="Requests per day")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Seconds per completion")
+    args = parser.parse_args()
+
+    fake_server = create_server(args.port, args.rpm, args.tpm, args.latency, args.rpd)
+    print(f"🤖 Fake Groq server listening on http://127.0.0.1:{args.port}")
+    try:
+        fake_server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nFake Groq server stopped.")
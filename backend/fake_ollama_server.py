@@ -0,0 +1,97 @@
+"""
+Local Fake Ollama Server for YouTube Legal Advisor AI Bot
+=========================================================
+
+A stand-in for the Ollama daemon's embedding API, used by the benchmark suite
+so OllamaEmbeddings can run over real HTTP without a model installed:
+- POST /api/embed returns feature-hashed vectors (see llm_backends.HashEmbeddings)
+- POST /api/embeddings supports the legacy single-prompt form
+- Configurable per-call latency
+
+Usage:
+    python fake_ollama_server.py --port 11435 --latency 0.01
+    OLLAMA_HOST=http://127.0.0.1:11435 python app.py
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from llm_backends import HashEmbeddings, HASH_EMBEDDINGS_DIMENSION
+import argparse
+import json
+import time
+
+# ==================== APPLICATION CONFIGURATION ====================
+DEFAULT_PORT = 11435
+DEFAULT_LATENCY = 0.01                    # Seconds of simulated embedding time per call
+
+
+# ==================== HTTP HANDLER ====================
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """
+    #️⃣ Serve Ollama-compatible embedding responses
+    """
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16                    # Send headers and body in one write (avoids delayed-ACK stalls)
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+
+        if path == "/api/embed":
+            texts = payload.get("input", "")
+            texts = [texts] if isinstance(texts, str) else list(texts)
+            time.sleep(self.server.latency)
+            self._send_json(200, {
+                "model": payload.get("model", "fake-embedder"),
+                "embeddings": self.server.embedder.embed_documents(texts),
+            })
+        elif path == "/api/embeddings":
+            time.sleep(self.server.latency)
+            self._send_json(200, {"embedding": self.server.embedder.embed_query(payload.get("prompt", ""))})
+        else:
+            self._send_json(404, {"error": "unknown endpoint"})
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 🔇 Keep the console quiet under load; the client side reports results
+        pass
+
+
+# ==================== SERVER LIFECYCLE ====================
+def create_server(port=DEFAULT_PORT, latency=DEFAULT_LATENCY, dimension=HASH_EMBEDDINGS_DIMENSION, host="127.0.0.1"):
+    """
+    🏗️ Build a fake Ollama server (call serve_forever() or start it in a thread)
+
+    Returns:
+        ThreadingHTTPServer: Server with `embedder` and `latency` attributes
+    """
+    server = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+    server.daemon_threads = True
+    server.embedder = HashEmbeddings(dimension=dimension, latency=0)
+    server.latency = latency
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake Ollama embedding server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Seconds per embedding call")
+    parser.add_argument("--dimension", type=int, default=HASH_EMBEDDINGS_DIMENSION)
+    args = parser.parse_args()
+
+    fake_server = create_server(args.port, args.latency, args.dimension)
+    print(f"#️⃣ Fake Ollama server listening on http://127.0.0.1:{args.port}")
+    try:
+        fake_server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nFake Ollama server stopped.")
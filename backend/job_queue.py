@@ -0,0 +1,274 @@
+"""
+Asynchronous Job Queue for YouTube Legal Advisor AI Bot
+======================================================
+
+Long contract simplifications and safety checks outlive the client's request
+timeout. This module runs them as background jobs instead:
+- Jobs are persisted in SQLite, so any worker process can report on them and
+  queued work survives a restart
+- A local thread pool claims and runs jobs, independent of the submitting request
+- Identical submissions are deduplicated onto the same job while its result is retained
+- Results expire after a TTL; rate-limited jobs are retried after the provider's Retry-After
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from llm_scheduler import LLMCapacityError
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "cache/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))                       # Background threads per process
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))            # Seconds finished jobs are kept
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))             # Tries before a rate-limited job fails
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "900"))       # Running jobs older than this are re-queued
+JOB_POLL_INTERVAL = 1.0                                                # Seconds between checks for jobs from other processes
+JOB_MAX_WAIT = 25.0                                                    # Longest long-poll a client may request
+PURGE_INTERVAL = 300                                                   # Seconds between expired-job cleanups
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+# ==================== JOB MANAGER ====================
+class JobManager:
+    """
+    🧵 Persistent job store plus a local worker pool
+
+    Args:
+        handlers (dict): Job type -> callable(payload) returning a JSON-serialisable result
+        db_path (str): SQLite database file
+        workers (int): Number of background worker threads
+        ttl (float): Seconds finished jobs (and their results) are retained
+
+    Usage:
+        job_manager = JobManager({"content_check": lambda payload: {...}})
+        job_manager.start()
+        job = job_manager.submit("content_check", {"text": "..."})
+    """
+
+    def __init__(self, handlers, db_path=JOB_DB_PATH, workers=JOB_WORKERS, ttl=JOB_RESULT_TTL):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handlers = handlers
+        self.db_path = db_path
+        self.workers = workers
+        self.ttl = ttl
+        self._wakeup = threading.Condition()
+        self._threads = []
+        self._last_purge = 0.0
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, type TEXT NOT NULL, input_hash TEXT NOT NULL, payload TEXT NOT NULL,"
+                " status TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL, started_at REAL, finished_at REAL, not_before REAL NOT NULL,"
+                " expires_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_input ON jobs (input_hash)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, not_before)")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    # ==================== LIFECYCLE ====================
+    def start(self):
+        """
+        🚀 Start the background worker threads (idempotent)
+        """
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    # ==================== SUBMISSION ====================
+    def submit(self, job_type, payload):
+        """
+        📥 Queue a job, or return the retained job for an identical submission
+
+        Args:
+            job_type (str): Registered handler name
+            payload (dict): JSON-serialisable input for the handler
+
+        Returns:
+            tuple: (job dict, deduplicated flag)
+
+        Raises:
+            ValueError: If job_type has no handler
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type '{job_type}'")
+
+        encoded = json.dumps(payload, sort_keys=True)
+        input_hash = hashlib.sha256(f"{job_type}:{encoded}".encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            existing = connection.execute(
+                "SELECT * FROM jobs WHERE input_hash = ? AND status != 'failed'"
+                " AND (expires_at IS NULL OR expires_at > ?) ORDER BY created_at DESC LIMIT 1",
+                (input_hash, now),
+            ).fetchone()
+            if existing:
+                connection.execute("COMMIT")
+                return self._to_dict(existing), True
+
+            job_id = uuid.uuid4().hex
+            connection.execute(
+                "INSERT INTO jobs (id, type, input_hash, payload, status, created_at, not_before)"
+                " VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, job_type, input_hash, encoded, now, now),
+            )
+            connection.execute("COMMIT")
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.get(job_id), False
+
+    # ==================== LOOKUP ====================
+    def get(self, job_id, wait=0.0):
+        """
+        🔍 Fetch a job, optionally long-polling until it finishes
+
+        Args:
+            job_id (str): Job identifier
+            wait (float): Seconds to wait for completion (capped at JOB_MAX_WAIT)
+
+        Returns:
+            dict | None: Job state, or None if unknown or expired
+        """
+        if not math.isfinite(wait):
+            wait = 0.0
+        deadline = time.monotonic() + min(max(wait, 0.0), JOB_MAX_WAIT)
+        while True:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (job_id, time.time()),
+                ).fetchone()
+            remaining = deadline - time.monotonic()
+            if row is None or row["status"] in FINISHED_STATUSES or remaining <= 0:
+                return self._to_dict(row) if row else None
+            with self._wakeup:
+                self._wakeup.wait(min(remaining, JOB_POLL_INTERVAL / 2))
+
+    def _to_dict(self, row):
+        job = {
+            "job_id": row["id"],
+            "type": row["type"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        if row["error"]:
+            job["error"] = row["error"]
+        return job
+
+    # ==================== WORKERS ====================
+    def _claim(self):
+        """
+        🎟️ Atomically move the oldest runnable job to "running"
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND started_at < ?",
+                (now - JOB_STALE_SECONDS,),
+            )
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND not_before <= ? ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (now, row["id"]),
+                )
+            connection.execute("COMMIT")
+        return row
+
+    def _finish(self, job_id, status, result=None, error=None, retry_at=None):
+        now = time.time()
+        with self._connect() as connection:
+            if retry_at is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'queued', not_before = ?, error = ? WHERE id = ?",
+                    (retry_at, error, job_id),
+                )
+            else:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+                    (status, json.dumps(result) if result is not None else None, error, now, now + self.ttl, job_id),
+                )
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _run(self, row):
+        """
+        ⚙️ Execute one claimed job and record its outcome
+        """
+        try:
+            result = self.handlers[row["type"]](json.loads(row["payload"]))
+        except LLMCapacityError as error:
+            if row["attempts"] < JOB_MAX_ATTEMPTS:
+                logger.warning(f"Job {row['id']} rate limited; retrying in {error.retry_after}s")
+                self._finish(row["id"], "queued", error=str(error), retry_at=time.time() + error.retry_after)
+            else:
+                self._finish(row["id"], "failed", error="AI service is busy; please resubmit later")
+            return
+        except Exception:
+            # 🔒 Exception text can expose internals; clients get a generic message, the log gets the traceback
+            logger.exception(f"Job {row['id']} ({row['type']}) failed")
+            self._finish(row["id"], "failed", error="Job failed")
+            return
+        self._finish(row["id"], "succeeded", result=result)
+        logger.info(f"Job {row['id']} ({row['type']}) succeeded")
+
+    def _purge_expired(self):
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        with self._connect() as connection:
+            connection.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+    def _worker_loop(self):
+        while True:
+            try:
+                self._purge_expired()
+                row = self._claim()
+            except sqlite3.Error as error:
+                logger.error(f"Job queue database error: {error}")
+                row = None
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(JOB_POLL_INTERVAL)
+                continue
+            self._run(row)
+
+    # ==================== MONITORING ====================
+    def snapshot(self):
+        """
+        📊 Count retained jobs by status
+        """
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["total"] for row in rows}
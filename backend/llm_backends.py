@@ -0,0 +1,243 @@
+"""
+Pluggable LLM and Embedding Backends for YouTube Legal Advisor AI Bot
+====================================================================
+
+This module builds the chat model and embedding engine from configuration:
+- LLM_BACKEND=groq (default) uses ChatGroq; LLM_BACKEND=fake uses a deterministic local model
+- EMBEDDINGS_BACKEND=ollama (default) uses OllamaEmbeddings; EMBEDDINGS_BACKEND=hash uses a hashing embedder
+- Per-thread model-time accounting, so request time can be split into model time and framework overhead
+
+The fake backends need no network, API key or Ollama daemon, which makes offline
+load tests and benchmarks of the Flask/LangChain/FAISS path possible.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+
+# ==================== APPLICATION CONFIGURATION ====================
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")                                   # "groq" or "fake"
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "ollama")                   # "ollama" or "hash"
+
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.05"))                  # Seconds before the first token
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "250"))
+FAKE_LLM_RESPONSE_TOKENS = int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", "64"))
+FAKE_LLM_STREAM_CHUNK_TOKENS = int(os.getenv("FAKE_LLM_STREAM_CHUNK_TOKENS", "4"))
+FAKE_EMBEDDINGS_LATENCY = float(os.getenv("FAKE_EMBEDDINGS_LATENCY", "0"))       # Seconds per embedding call
+HASH_EMBEDDINGS_DIMENSION = int(os.getenv("HASH_EMBEDDINGS_DIMENSION", "1536"))  # Matches the shipped FAISS index
+
+_FAKE_VOCABULARY = (
+    "creator contract clause payment brand rights content policy review term notice "
+    "exclusivity license revenue channel obligation period renewal indemnity guideline video"
+).split()
+_WORD_PATTERN = re.compile(r"\w+")
+_CLAUSE_MARKER = re.compile(r"\[\[CLAUSE \d+\]\]")      # Section markers of the batched clause analysis prompt
+
+
+# ==================== MODEL TIME ACCOUNTING ====================
+class ModelTimer:
+    """
+    ⏱️ Per-thread accumulator of time spent waiting on model calls
+
+    Flask handles each request on a single thread, so resetting at the start of
+    a request and reading at the end yields that request's model time.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def reset(self):
+        self._local.seconds = 0.0
+
+    def add(self, seconds):
+        self._local.seconds = getattr(self._local, "seconds", 0.0) + seconds
+
+    def total(self):
+        return getattr(self._local, "seconds", 0.0)
+
+    def httpx_event_hooks(self):
+        """
+        🔌 httpx hooks that charge each HTTP round trip (until headers) to model time
+        """
+        def on_request(request):
+            request.extensions["model_timer_start"] = time.perf_counter()
+
+        def on_response(response):
+            started = response.request.extensions.get("model_timer_start")
+            if started is not None:
+                self.add(time.perf_counter() - started)
+
+        return {"request": [on_request], "response": [on_response]}
+
+
+model_timer = ModelTimer()
+
+
+# ==================== FAKE CHAT MODEL ====================
+class LocalFakeChatModel(BaseChatModel):
+    """
+    🤖 Deterministic offline chat model with configurable latency and token rate
+
+    The same prompt always yields the same answer. Time is simulated with
+    `latency` before the first token plus `response_tokens / tokens_per_second`.
+    """
+
+    latency: float = FAKE_LLM_LATENCY
+    tokens_per_second: float = FAKE_LLM_TOKENS_PER_SECOND
+    response_tokens: int = FAKE_LLM_RESPONSE_TOKENS
+    stream_chunk_tokens: int = FAKE_LLM_STREAM_CHUNK_TOKENS
+
+    @property
+    def _llm_type(self):
+        return "local-fake"
+
+    def _response_words(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        words = [f"[fake:{digest[:4].hex()}]"]
+        for index in range(self.response_tokens - 1):
+            words.append(_FAKE_VOCABULARY[digest[index % len(digest)] % len(_FAKE_VOCABULARY)])
+
+        # 🏷️ Answer every clause marker in the prompt with its own section, as a real model
+        # following CLAUSE_ANALYSIS_TEMPLATE does, so batches split without per-clause retries
+        markers = list(dict.fromkeys(_CLAUSE_MARKER.findall(prompt)))
+        if markers:
+            share = max(4, (len(words) - 1) // len(markers))
+            sections = [words[0]]
+            for number, marker in enumerate(markers):
+                sections.append(marker)
+                sections.extend(_FAKE_VOCABULARY[digest[(number * share + offset) % len(digest)] % len(_FAKE_VOCABULARY)]
+                                for offset in range(share))
+            words = sections
+        return prompt, words
+
+    def _usage(self, prompt, words):
+        input_tokens = max(1, math.ceil(len(prompt) / 4))
+        return {"input_tokens": input_tokens, "output_tokens": len(words), "total_tokens": input_tokens + len(words)}
+
+    def _simulate(self, seconds):
+        time.sleep(seconds)
+        model_timer.add(seconds)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, words = self._response_words(messages)
+        self._simulate(self.latency + len(words) / self.tokens_per_second)
+        message = AIMessage(content=" ".join(words), usage_metadata=self._usage(prompt, words))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, words = self._response_words(messages)
+        self._simulate(self.latency)
+        for start in range(0, len(words), self.stream_chunk_tokens):
+            chunk_words = words[start:start + self.stream_chunk_tokens]
+            self._simulate(len(chunk_words) / self.tokens_per_second)
+            text = " ".join(chunk_words) + ("" if start + len(chunk_words) >= len(words) else " ")
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+# ==================== HASH EMBEDDINGS ====================
+class HashEmbeddings(Embeddings):
+    """
+    #️⃣ Feature-hashing embedder: deterministic, offline and roughly lexical
+
+    Each lowercase word is hashed to a signed bucket, so texts that share words
+    get similar vectors and FAISS retrieval stays meaningful without a model.
+
+    Args:
+        dimension (int): Vector size; must match the FAISS index being queried
+        latency (float): Simulated seconds per embedding call
+    """
+
+    def __init__(self, dimension=HASH_EMBEDDINGS_DIMENSION, latency=FAKE_EMBEDDINGS_LATENCY):
+        self.dimension = dimension
+        self.latency = latency
+
+    def _embed(self, text):
+        vector = [0.0] * self.dimension
+        for word in _WORD_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def _simulate(self):
+        if self.latency:
+            time.sleep(self.latency)
+            model_timer.add(self.latency)
+
+    def embed_documents(self, texts):
+        self._simulate()
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        self._simulate()
+        return self._embed(text)
+
+
+# ==================== BACKEND FACTORIES ====================
+def create_llm(model_name, api_key=None, temperature=0.2, response_hooks=None, backend=None):
+    """
+    🏭 Build the configured chat model
+
+    Args:
+        model_name (str): Groq model identifier (ignored by the fake backend)
+        api_key (SecretStr | str | None): Groq API key
+        temperature (float): Sampling temperature
+        response_hooks (list): Extra httpx response hooks, e.g. rate-limit feedback
+        backend (str): Override for LLM_BACKEND
+
+    Returns:
+        BaseChatModel: ChatGroq or LocalFakeChatModel
+    """
+    backend = backend or LLM_BACKEND
+    if backend == "fake":
+        return LocalFakeChatModel()
+    if backend != "groq":
+        raise ValueError(f"Unknown LLM_BACKEND '{backend}' (expected 'groq' or 'fake')")
+
+    from langchain_groq import ChatGroq
+    import httpx
+
+    event_hooks = model_timer.httpx_event_hooks()
+    event_hooks["response"].extend(response_hooks or [])
+    return ChatGroq(
+        api_key=api_key,
+        model=model_name,
+        temperature=temperature,
+        max_retries=0,                    # 429s must reach RateLimitScheduler.call, not sleep inside the SDK
+        http_client=httpx.Client(event_hooks=event_hooks),
+    )
+
+
+def create_embeddings(model_name, backend=None):
+    """
+    🏭 Build the configured embedding engine
+
+    Args:
+        model_name (str): Ollama model identifier (ignored by the hash backend)
+        backend (str): Override for EMBEDDINGS_BACKEND
+
+    Returns:
+        Embeddings: OllamaEmbeddings or HashEmbeddings
+    """
+    backend = backend or EMBEDDINGS_BACKEND
+    if backend == "hash":
+        return HashEmbeddings()
+    if backend != "ollama":
+        raise ValueError(f"Unknown EMBEDDINGS_BACKEND '{backend}' (expected 'ollama' or 'hash')")
+
+    from langchain_ollama import OllamaEmbeddings
+
+    return OllamaEmbeddings(model=model_name, client_kwargs={"event_hooks": model_timer.httpx_event_hooks()})
@@ -0,0 +1,284 @@
+"""
+Outbound LLM Rate-Limit Scheduler for YouTube Legal Advisor AI Bot
+=================================================================
+
+This module keeps outbound Groq calls inside the account's rate limits:
+- Token buckets for requests-per-minute and tokens-per-minute
+- Budgets re-synchronised from Groq's x-ratelimit-* response headers
+- Prompt token estimation before a call is sent
+- Bounded waiting: bursts are smoothed, and calls that would wait too long are shed
+
+Shed calls raise LLMCapacityError carrying a Retry-After hint for the API layer.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+import logging
+import math
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+# Defaults match Groq's free tier; the live limits from response headers take over once seen
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
+LLM_MAX_QUEUE_WAIT = float(os.getenv("LLM_MAX_QUEUE_WAIT", "15"))             # Seconds a call may wait for budget
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "512"))
+CHARS_PER_TOKEN = 4                                                            # Rough English average for BPE tokenizers
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+# ==================== EXCEPTIONS ====================
+class LLMCapacityError(Exception):
+    """
+    ⏳ Raised when an LLM call is shed because the rate-limit budget is exhausted
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+# ==================== HELPER FUNCTIONS ====================
+def estimate_tokens(text):
+    """
+    🔢 Estimate the number of tokens in a prompt without a tokenizer
+
+    Args:
+        text (str): Prompt text
+
+    Returns:
+        int: Approximate token count (at least 1)
+    """
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def parse_reset_duration(value):
+    """
+    ⏱️ Parse Groq reset durations such as "7.66s", "2m59.56s" or "120ms"
+
+    Args:
+        value (str): Header value
+
+    Returns:
+        float | None: Seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+# ==================== TOKEN BUCKET ====================
+class TokenBucket:
+    """
+    🪣 Reservation-based token bucket refilled continuously over one minute
+
+    Reservations may push the balance negative; the caller then sleeps until
+    the debt is repaid, which spaces out bursts instead of rejecting them.
+
+    Args:
+        per_minute (int): Bucket capacity and refill amount per 60 seconds
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def refill_rate(self):
+        return self.capacity / 60.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        ⏳ Seconds until `amount` could be taken without debt
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def reserve(self, amount, now):
+        """
+        🎟️ Take `amount` now, possibly going into debt
+        """
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, limit, remaining, now):
+        """
+        🔄 Align the bucket with the server's view of the budget
+
+        Args:
+            limit (int | None): Server-reported per-minute limit
+            remaining (int | None): Server-reported remaining budget
+        """
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+
+
+# ==================== RATE-LIMIT SCHEDULER ====================
+class RateLimitScheduler:
+    """
+    🚥 Admit outbound LLM calls against request and token budgets
+
+    Usage:
+        scheduler = RateLimitScheduler()
+        http_client = httpx.Client(event_hooks={"response": [scheduler.observe_response]})
+        result = scheduler.call(lambda: chain.invoke(inputs), estimated_tokens)
+
+    With enforce_limits=False (local backends with no provider quota) calls are
+    admitted immediately and only counted.
+    """
+
+    def __init__(self, requests_per_minute=GROQ_REQUESTS_PER_MINUTE, tokens_per_minute=GROQ_TOKENS_PER_MINUTE,
+                 max_wait=LLM_MAX_QUEUE_WAIT, enforce_limits=True):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_wait = max_wait
+        self.enforce_limits = enforce_limits
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"admitted": 0, "delayed": 0, "shed": 0, "rate_limited": 0, "wait_seconds": 0.0}
+
+    def acquire(self, estimated_tokens):
+        """
+        🎟️ Reserve budget for one call, sleeping if the budget is briefly exhausted
+
+        Args:
+            estimated_tokens (int): Prompt plus expected completion tokens
+
+        Returns:
+            float: Seconds waited before the call may be sent
+
+        Raises:
+            LLMCapacityError: If the call would wait longer than max_wait
+        """
+        with self._lock:
+            if not self.enforce_limits:
+                self._stats["admitted"] += 1
+                return 0.0
+            now = time.monotonic()
+            wait = max(
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(estimated_tokens, now),
+                self.blocked_until - now,
+            )
+            if wait > self.max_wait:
+                self._stats["shed"] += 1
+                raise LLMCapacityError(f"LLM rate limit budget exhausted, retry in {wait:.1f}s", wait)
+
+            self.requests.reserve(1, now)
+            self.tokens.reserve(estimated_tokens, now)
+            self._stats["admitted"] += 1
+            if wait > 0:
+                self._stats["delayed"] += 1
+                self._stats["wait_seconds"] += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def call(self, invoke, estimated_tokens):
+        """
+        🚀 Run `invoke()` once budget is available, mapping upstream 429s to LLMCapacityError
+
+        Args:
+            invoke (callable): Zero-argument function performing the LLM call
+            estimated_tokens (int): Prompt plus expected completion tokens
+
+        Returns:
+            Any: Whatever `invoke()` returns
+        """
+        self.acquire(estimated_tokens)
+        try:
+            return invoke()
+        except Exception as error:
+            if getattr(error, "status_code", None) != 429:
+                raise
+            response = getattr(error, "response", None)
+            retry_after = parse_reset_duration(response.headers.get("retry-after")) if response is not None else None
+            raise LLMCapacityError("LLM provider rate limit reached", retry_after or 1) from error
+
+    # ==================== RESPONSE HEADER FEEDBACK ====================
+    def observe_response(self, response):
+        """
+        📥 httpx response hook: update budgets from x-ratelimit-* headers
+
+        Args:
+            response (httpx.Response): Response from the LLM provider
+        """
+        self.observe_headers(response.headers, response.status_code)
+
+    def observe_headers(self, headers, status_code=200):
+        """
+        🔄 Update budgets from Groq rate-limit headers
+
+        Args:
+            headers (Mapping): Response headers (case-insensitive mapping)
+            status_code (int): HTTP status of the response
+        """
+        def as_int(name):
+            value = headers.get(name)
+            try:
+                return int(float(value)) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            now = time.monotonic()
+            # x-ratelimit-*-tokens is the per-minute token budget
+            self.tokens.sync(as_int("x-ratelimit-limit-tokens"), as_int("x-ratelimit-remaining-tokens"), now)
+
+            # x-ratelimit-*-requests is a daily budget; only honour it when it runs out
+            if as_int("x-ratelimit-remaining-requests") == 0:
+                reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+                if reset:
+                    self.blocked_until = max(self.blocked_until, now + reset)
+
+            if status_code == 429:
+                self._stats["rate_limited"] += 1
+                retry_after = parse_reset_duration(headers.get("retry-after"))
+                retry_after = retry_after or parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) or 1.0
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                logger.warning(f"LLM provider returned 429; pausing outbound calls for {retry_after:.1f}s")
+
+    # ==================== MONITORING ====================
+    def snapshot(self):
+        """
+        📊 Return current budgets and admission counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            return dict(
+                self._stats,
+                enforce_limits=self.enforce_limits,
+                wait_seconds=round(self._stats["wait_seconds"], 3),
+                requests_available=round(self.requests.tokens, 1),
+                requests_per_minute=self.requests.capacity,
+                tokens_available=round(self.tokens.tokens, 1),
+                tokens_per_minute=self.tokens.capacity,
+                blocked_for=round(max(0.0, self.blocked_until - now), 2),
+            )
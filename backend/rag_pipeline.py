@@ -1,11 +1,11 @@
+import logging
 import os
 from dotenv import load_dotenv
 
 # LangChain / model imports
 from langchain_community.vectorstores import FAISS
-from langchain_ollama import OllamaEmbeddings
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
+from llm_backends import create_llm, create_embeddings, LLM_BACKEND, EMBEDDINGS_BACKEND
 
 # ==================== ENVIRONMENT & CONFIG ====================
 load_dotenv()  # load .env file if present
@@ -24,10 +24,12 @@ MODEL_CONFIG = {
 
 DEBUG_MODE = True
 
+logger = logging.getLogger(__name__)
+
 # ==================== VECTOR DATABASE OPERATIONS ====================
 
 def initialize_vector_database(path: str = FAISS_DB_PATH):
-    """Initialize Ollama embeddings and load FAISS vectorstore from local directory.
+    """Initialize embeddings (Ollama, or the offline hash embedder) and load FAISS vectorstore from local directory.
 
     Returns:
         FAISS vectorstore instance
@@ -35,12 +37,10 @@ def initialize_vector_database(path: str = FAISS_DB_PATH):
         Exception: If loading fails
     """
     try:
-        if DEBUG_MODE:
-            print("🔧 Initializing Ollama embeddings with model:", OLLAMA_MODEL_NAME)
-        embedding_model = OllamaEmbeddings(model=OLLAMA_MODEL_NAME)
+        logger.debug(f"Initializing {EMBEDDINGS_BACKEND} embeddings with model: {OLLAMA_MODEL_NAME}")
+        embedding_model = create_embeddings(OLLAMA_MODEL_NAME)
 
-        if DEBUG_MODE:
-            print("🔧 Loading FAISS database from:", path)
+        logger.debug(f"Loading FAISS database from: {path}")
 
         vector_db = FAISS.load_local(
             path,
@@ -48,33 +48,32 @@ def initialize_vector_database(path: str = FAISS_DB_PATH):
             allow_dangerous_deserialization=True,
         )
 
-        if DEBUG_MODE:
-            print("✅ FAISS vector database loaded successfully")
+        logger.debug("FAISS vector database loaded successfully")
 
         return vector_db
 
     except Exception as e:
-        print("❌ Failed to load FAISS vector database:", str(e))
+        logger.error(f"Failed to load FAISS vector database: {str(e)}")
         raise
 
 
 # ==================== LLM SETUP & CONFIGURATION ====================
 
 def configure_llm_model(api_key: str = GROQ_API_KEY, model_name: str = GROQ_MODEL_NAME):
-    """Configure and return the Groq LLM instance.
+    """Configure and return the LLM instance.
 
-    Performs a basic API key check and returns a ChatGroq instance.
+    Performs a basic API key check and returns a ChatGroq instance, or the
+    offline fake model when LLM_BACKEND=fake.
     """
-    if not api_key:
+    if not api_key and LLM_BACKEND == "groq":
         # don't crash silently — inform the user and continue (tests or offline dev may not have key)
-        print("⚠️  GROQ_API_KEY not found in environment variables. LLM calls will likely fail.")
+        logger.warning("GROQ_API_KEY not found in environment variables. LLM calls will likely fail.")
 
-    if DEBUG_MODE:
-        print("🔧 Configuring Groq LLM with model:", model_name)
+    logger.debug(f"Configuring {LLM_BACKEND} LLM with model: {model_name}")
 
-    llm = ChatGroq(
+    llm = create_llm(
+        model_name,
         api_key=api_key,
-        model_name=model_name,
         temperature=MODEL_CONFIG.get("temperature", 0.2),
         # additional parameters like max_tokens/timeouts can be added here if supported
     )
@@ -90,9 +89,7 @@ def extract_document_context(retrieved_docs):
         return ""
     context = "\n\n".join([getattr(doc, "page_content", str(doc)) for doc in retrieved_docs])
 
-    if DEBUG_MODE:
-        print(f"📊 Retrieved {len(retrieved_docs)} documents for context")
-        print(f"📝 Context length: {len(context)} characters")
+    logger.debug(f"Retrieved {len(retrieved_docs)} documents for context ({len(context)} characters)")
 
     return context
 
@@ -142,28 +139,27 @@ def process_legal_query(llm_instance, vector_database, user_query: str):
         if vector_database is not None:
             retrieved_documents = vector_database.similarity_search(user_query)
         else:
-            if DEBUG_MODE:
-                print("⚠️  No vector database provided; proceeding without retrieved context.")
+            logger.warning("No vector database provided; proceeding without retrieved context.")
 
         document_context = extract_document_context(retrieved_documents)
 
         prompt_template = ChatPromptTemplate.from_template(LEGAL_ASSISTANT_PROMPT)
         rag_chain = prompt_template | llm_instance
 
-        if DEBUG_MODE:
-            print("🔧 Executing RAG pipeline...")
-            print("📝 Query:", user_query)
+        logger.debug(f"Executing RAG pipeline for query: {user_query}")
 
         # invoke the chain
         return rag_chain.invoke({"question": user_query, "context": document_context})
 
     except Exception as e:
-        print("❌ Error while processing legal query:", str(e))
+        logger.error(f"Error while processing legal query: {str(e)}")
         raise
 
 
 # ==================== MAIN EXECUTION BLOCK ====================
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if DEBUG_MODE else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s %(message)s")
     try:
         print("[🔧] Initializing FAISS vector database...")
         vector_db = None
@@ -0,0 +1,245 @@
+"""
+On-Demand Request Profiling for YouTube Legal Advisor AI Bot
+===========================================================
+
+When one /api request is slow it is hard to tell whether the time went to
+request parsing, embeddings, FAISS search, LangChain overhead or the LLM.
+This module profiles individual requests on demand:
+- A sampling profiler snapshots the request thread's stack every few milliseconds
+  (time spent waiting on the network shows up under the Python frame that waits)
+- Profiles are written as speedscope JSON and as folded stacks for flamegraph.pl
+- The top-N hot frames (by self time) are returned in response headers
+
+Profiling is opt-in: send "X-Profile: <PROFILE_TOKEN>" or set PROFILE_SAMPLE_RATE.
+With neither configured no hooks are registered, so there is no overhead at all.
+Only the request's own thread is sampled, not helper thread pools it fans out to.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from flask import g, request
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")                             # Secret for the X-Profile header; empty disables it
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))         # Fraction of /api requests profiled automatically
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+PROFILE_TOP_FRAMES = int(os.getenv("PROFILE_TOP_FRAMES", "5"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))             # Oldest profiles beyond this are deleted
+MAX_SAMPLES = 60000                                                        # Safety cap per request (5 minutes at 5 ms)
+
+
+# ==================== STACK SAMPLER ====================
+class StackSampler:
+    """
+    🔬 Background thread that samples one thread's Python stack at a fixed interval
+
+    Args:
+        thread_id (int): Identifier of the thread to sample (threading.get_ident())
+        interval (float): Seconds between samples
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []                    # (name, file, line) per distinct frame
+        self.samples = []                   # Stacks as tuples of frame indexes, root first
+        self.weights = []                   # Milliseconds each sample stands for
+        self._frame_index = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval) and len(self.samples) < MAX_SAMPLES:
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+                index = self._frame_index.get(key)
+                if index is None:
+                    index = self._frame_index[key] = len(self.frames)
+                    self.frames.append(key)
+                stack.append(index)
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(tuple(stack))
+            self.weights.append((now - last) * 1000)
+            last = now
+
+    # ==================== REPORTS ====================
+    def top_frames(self, limit):
+        """
+        🔥 Frames with the most self time (leaf of the sampled stack)
+
+        Returns:
+            list: (share of sampled time, frame tuple) pairs, hottest first
+        """
+        total = sum(self.weights) or 1.0
+        self_time = {}
+        for stack, weight in zip(self.samples, self.weights):
+            self_time[stack[-1]] = self_time.get(stack[-1], 0.0) + weight
+        ranked = sorted(self_time.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(weight / total, self.frames[index]) for index, weight in ranked]
+
+    def to_speedscope(self, name):
+        """
+        📈 Render the samples in speedscope's "sampled" file format
+        """
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "youtube-advisor request_profiling",
+            "shared": {"frames": [{"name": frame_name, "file": path, "line": line}
+                                  for frame_name, path, line in self.frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": [list(stack) for stack in self.samples],
+                "weights": [round(weight, 3) for weight in self.weights],
+            }],
+        }
+
+    def to_folded(self):
+        """
+        🔥 Render the samples as folded stacks ("a;b;c <ms>") for flamegraph.pl
+        """
+        totals = {}
+        for stack, weight in zip(self.samples, self.weights):
+            totals[stack] = totals.get(stack, 0.0) + weight
+        lines = []
+        for stack, weight in totals.items():
+            names = ";".join(f"{self.frames[index][0]} ({os.path.basename(self.frames[index][1])})" for index in stack)
+            lines.append(f"{names} {max(1, round(weight))}")
+        return "\n".join(lines) + "\n"
+
+
+def _describe_frame(frame):
+    name, path, line = frame
+    return f"{name} ({os.path.basename(path)}:{line})"
+
+
+# ==================== FLASK INTEGRATION ====================
+class RequestProfiler:
+    """
+    🔬 Flask hooks that profile opted-in /api requests
+
+    Usage:
+        request_profiler = RequestProfiler(app)
+    """
+
+    def __init__(self, app=None, token=PROFILE_TOKEN, sample_rate=PROFILE_SAMPLE_RATE,
+                 output_dir=PROFILE_OUTPUT_DIR, interval_ms=PROFILE_INTERVAL_MS):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.interval = interval_ms / 1000
+        self.enabled = bool(token) or sample_rate > 0
+        self.profiled = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        ⚙️ Register hooks only when profiling can actually be triggered
+        """
+        if not self.enabled:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        app.before_request(self.start_profile)
+        app.after_request(self.finish_profile)
+        app.teardown_request(self.stop_profile)
+        logger.info(f"Request profiling enabled (header: {bool(self.token)}, sample rate: {self.sample_rate})")
+
+    def _requested(self):
+        if not request.path.startswith("/api/"):
+            return False
+        header = request.headers.get("X-Profile", "")
+        if self.token and header and hmac.compare_digest(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start_profile(self):
+        """
+        ▶️ Before-request hook: start sampling this request's thread
+        """
+        if self._requested():
+            sampler = StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+            g.profile_sampler = sampler
+
+    def finish_profile(self, response):
+        """
+        ⏹️ After-request hook: stop sampling, add hot-frame headers, write files in the background
+        """
+        sampler = g.pop("profile_sampler", None)
+        if sampler is None:
+            return response
+        sampler.stop()
+        profile_id = uuid.uuid4().hex[:12]
+        self.profiled += 1
+
+        response.headers["X-Profile-Id"] = profile_id
+        response.headers["X-Profile-Samples"] = f"{len(sampler.samples)} samples / {sampler.duration_ms:.1f} ms"
+        response.headers["X-Profile-Top"] = "; ".join(
+            f"{share * 100:.1f}% {_describe_frame(frame)}" for share, frame in sampler.top_frames(PROFILE_TOP_FRAMES)
+        )
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{profile_id}"
+        threading.Thread(target=self._write, args=(sampler, name, f"{request.method} {request.path}"), daemon=True).start()
+        return response
+
+    def stop_profile(self, error=None):
+        """
+        🧹 Teardown hook: make sure the sampler stops when the handler raised
+        """
+        sampler = g.pop("profile_sampler", None)
+        if sampler is not None:
+            sampler.stop()
+
+    def _write(self, sampler, name, title):
+        """
+        💾 Write speedscope and folded-stack files, then prune old profiles
+        """
+        try:
+            with open(os.path.join(self.output_dir, f"{name}.speedscope.json"), "w", encoding="utf-8") as handle:
+                json.dump(sampler.to_speedscope(title), handle)
+            with open(os.path.join(self.output_dir, f"{name}.folded"), "w", encoding="utf-8") as handle:
+                handle.write(sampler.to_folded())
+            files = sorted(os.listdir(self.output_dir))
+            for stale in files[:max(0, len(files) - 2 * PROFILE_MAX_FILES)]:
+                os.remove(os.path.join(self.output_dir, stale))
+        except OSError as error:
+            logger.error(f"Could not write profile {name}: {error}")
+
+    def snapshot(self):
+        """
+        📊 Profiling configuration and number of profiled requests
+        """
+        return {"enabled": self.enabled, "sample_rate": self.sample_rate, "profiled": self.profiled,
+                "output_dir": self.output_dir}
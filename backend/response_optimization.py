@@ -0,0 +1,222 @@
+"""
+Response Optimization Middleware for YouTube Legal Advisor AI Bot
+================================================================
+
+This module trims the bytes the Flask API puts on the wire:
+- gzip / brotli compression for JSON and text responses
+- Strong, content-hashed ETags with 304 Not Modified handling
+- Long-lived immutable cache headers for fingerprinted static assets
+- Per-endpoint counters of bytes saved by compression
+
+Brotli is optional: when the `brotli` package is not installed only gzip is offered.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from flask import request, url_for
+import gzip
+import hashlib
+import os
+import threading
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# ==================== APPLICATION CONFIGURATION ====================
+# Configuration constants for response compression and caching
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+MIN_COMPRESS_SIZE = int(os.getenv("RESPONSE_MIN_COMPRESS_SIZE", "500"))   # Smaller bodies are not worth compressing
+GZIP_LEVEL = 6                                                            # Balanced speed / ratio for dynamic content
+BROTLI_QUALITY = 5                                                        # Dynamic-content quality, not the slow max of 11
+IMMUTABLE_MAX_AGE = 31536000                                              # One year for fingerprinted assets
+ASSET_VERSION_ARG = "v"                                                   # Query argument carrying the asset fingerprint
+
+
+# ==================== RESPONSE OPTIMIZER ====================
+class ResponseOptimizer:
+    """
+    🗜️ Flask after-request hook that compresses, tags and caches responses
+
+    Usage:
+        response_optimizer = ResponseOptimizer(app)
+
+    Templates get an `asset_url(filename)` helper that appends a content
+    fingerprint to static URLs so they can be cached forever by browsers.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._asset_fingerprints = {}
+        self._stats = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        ⚙️ Register the after-request hook and the `asset_url` template helper
+
+        Args:
+            app (Flask): Application to optimize
+        """
+        self._static_folder = app.static_folder
+        app.after_request(self.optimize_response)
+        app.jinja_env.globals["asset_url"] = self.asset_url
+
+    # ==================== STATIC ASSET FINGERPRINTS ====================
+    def asset_fingerprint(self, filename):
+        """
+        🔖 Return a short content hash for a static file, cached per mtime
+
+        Args:
+            filename (str): Path relative to the static folder
+
+        Returns:
+            str: First 12 hex characters of the file's SHA-256, or "" if missing
+        """
+        path = os.path.join(self._static_folder, filename)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return ""
+
+        cached = self._asset_fingerprints.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, "rb") as asset_file:
+            fingerprint = hashlib.sha256(asset_file.read()).hexdigest()[:12]
+        self._asset_fingerprints[filename] = (mtime, fingerprint)
+        return fingerprint
+
+    def asset_url(self, filename):
+        """
+        🔗 Build a fingerprinted URL for a static asset
+
+        Args:
+            filename (str): Path relative to the static folder
+
+        Returns:
+            str: URL such as /static/Images/favicon.png?v=3f2a9c01d4e5
+        """
+        fingerprint = self.asset_fingerprint(filename)
+        if not fingerprint:
+            return url_for("static", filename=filename)
+        return url_for("static", filename=filename, **{ASSET_VERSION_ARG: fingerprint})
+
+    # ==================== AFTER-REQUEST HOOK ====================
+    def optimize_response(self, response):
+        """
+        🚀 Apply caching headers, ETags and compression to an outgoing response
+
+        Args:
+            response (Response): Response produced by the view
+
+        Returns:
+            Response: The optimized response (possibly a 304)
+        """
+        if request.endpoint == "static":
+            return self._apply_static_cache_headers(response)
+
+        # 🌊 Streamed and file responses would have to be buffered whole to hash or compress them
+        if response.is_streamed or response.direct_passthrough or response.status_code != 200:
+            return response
+        if response.headers.get("Content-Encoding"):
+            return response
+
+        body = response.get_data()
+        encoding = self._choose_encoding(response, body)
+
+        # 🔖 Strong ETag per representation; 304s only apply to GET/HEAD
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        if encoding:
+            etag = f"{etag}-{encoding}"
+        response.set_etag(etag)
+        if request.method in ("GET", "HEAD"):
+            response.headers.setdefault("Cache-Control", "no-cache")
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        if encoding:
+            self._compress(response, body, encoding)
+        return response
+
+    def _apply_static_cache_headers(self, response):
+        """
+        🗂️ Mark fingerprinted static assets as immutable, revalidate the rest
+        """
+        filename = (request.view_args or {}).get("filename", "")
+        requested_version = request.args.get(ASSET_VERSION_ARG)
+        if requested_version and requested_version == self.asset_fingerprint(filename):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        else:
+            response.cache_control.no_cache = True
+        return response
+
+    def _choose_encoding(self, response, body):
+        """
+        🎯 Pick "br", "gzip" or None for this response and client
+        """
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES or len(body) < MIN_COMPRESS_SIZE:
+            return None
+
+        response.vary.add("Accept-Encoding")
+        accepted = request.accept_encodings
+        if BROTLI_AVAILABLE and accepted["br"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compress(self, response, body, encoding):
+        """
+        🗜️ Replace the response body with its compressed form and record savings
+        """
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        self._record(request.endpoint or "unknown", len(body), len(compressed))
+
+    # ==================== MONITORING ====================
+    def _record(self, endpoint, original_bytes, sent_bytes):
+        with self._lock:
+            entry = self._stats.setdefault(endpoint, {"responses": 0, "original_bytes": 0, "sent_bytes": 0})
+            entry["responses"] += 1
+            entry["original_bytes"] += original_bytes
+            entry["sent_bytes"] += sent_bytes
+
+    def snapshot(self):
+        """
+        📊 Return bytes saved by compression, per endpoint
+
+        Returns:
+            dict: {endpoint: {responses, original_bytes, sent_bytes, bytes_saved, ratio}}
+        """
+        with self._lock:
+            report = {}
+            for endpoint, entry in self._stats.items():
+                saved = entry["original_bytes"] - entry["sent_bytes"]
+                report[endpoint] = dict(
+                    entry,
+                    bytes_saved=saved,
+                    ratio=round(entry["sent_bytes"] / entry["original_bytes"], 3) if entry["original_bytes"] else 1.0,
+                )
+            return report
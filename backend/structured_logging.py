@@ -0,0 +1,331 @@
+"""
+Structured Logging for YouTube Legal Advisor AI Bot
+==================================================
+
+Request handlers should never wait on log I/O. This module sets up:
+- A non-blocking queue handler: the request thread only enqueues records, and a
+  background writer formats them (including tracebacks) and writes them in batches
+- JSON lines with timestamp, level, logger, message, request id and any extra fields
+- Request ids (taken from an incoming X-Request-ID header or generated) echoed in responses
+- Per-stage durations (model, queue, retrieval, ...) in one access log line per request
+- Sampling of INFO-and-below records; warnings and errors are always kept
+- Records are dropped (and counted) rather than blocking if the queue ever fills up
+
+LOG_FORMAT=text switches the output to plain lines for local development.
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, request
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+# ==================== APPLICATION CONFIGURATION ====================
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")                                # "json" or "text"
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))      # Share of INFO/DEBUG records kept
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))                  # Records beyond this are dropped
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.05"))         # Seconds between background writes
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Attributes every LogRecord has; anything else was passed via extra= and is emitted as a field
+_RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "keep"}
+
+_request_id = ContextVar("request_id", default=None)
+_stages = ContextVar("stages", default=None)
+
+
+# ==================== REQUEST CONTEXT ====================
+def current_request_id():
+    """
+    🆔 Request id of the request being handled on this thread (None outside requests)
+    """
+    return _request_id.get()
+
+
+def record_stage(name, seconds):
+    """
+    ⏱️ Add time to a named stage of the current request (no-op outside requests)
+    """
+    stages = _stages.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_stage(name):
+    """
+    ⏱️ Time a block as a named stage of the current request
+
+    Usage:
+        with timed_stage("retrieval"):
+            documents = store.search(question)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+# ==================== HANDLERS AND FORMATTERS ====================
+class JsonFormatter(logging.Formatter):
+    """
+    🧾 One JSON object per line, with extra= fields promoted to top-level keys
+    """
+
+    converter = time.gmtime                 # "ts" carries a Z suffix, so render it in UTC
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    📮 Queue handler that tags records with the request id and never blocks
+
+    Unlike the standard QueueHandler it does not format records on the calling
+    thread (messages and tracebacks are rendered by the background writer), takes
+    no handler lock, and drops records instead of waiting when the queue is full.
+
+    Args:
+        log_queue (queue.SimpleQueue): Queue drained by a BatchingListener
+        sample_rate (float): Share of INFO/DEBUG records kept
+        max_size (int): Queue length beyond which records are dropped
+    """
+
+    def __init__(self, log_queue, sample_rate=1.0, max_size=LOG_QUEUE_SIZE):
+        super().__init__(log_queue)
+        self.sample_rate = sample_rate
+        self.max_size = max_size
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def handle(self, record):
+        # 🔓 SimpleQueue is thread-safe, so skip Handler.handle()'s lock
+        if self.filters and not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record):
+        if (record.levelno <= logging.INFO and self.sample_rate < 1.0
+                and not getattr(record, "keep", False) and random.random() >= self.sample_rate):
+            self.sampled_out += 1
+            return
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        record.request_id = _request_id.get()
+        if record.args:
+            record.msg, record.args = record.getMessage(), None
+        self.queue.put_nowait(record)
+
+
+# ==================== BACKGROUND WRITER ====================
+class BatchingListener:
+    """
+    🧺 Background thread that drains the log queue in batches and writes each batch at once
+
+    Waking up every LOG_FLUSH_INTERVAL instead of once per record keeps thread
+    switches off the request threads and turns many small writes into one.
+
+    Args:
+        log_queue (queue.SimpleQueue): Queue filled by NonBlockingQueueHandler
+        formatter (logging.Formatter): Renders each record to one line
+        stream (file): Output stream
+        interval (float): Seconds between drains
+    """
+
+    def __init__(self, log_queue, formatter, stream, interval=LOG_FLUSH_INTERVAL):
+        self.queue = log_queue
+        self.formatter = formatter
+        self.stream = stream
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """
+        ⏹️ Flush everything still queued and stop the thread
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        lines = []
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception as error:
+                lines.append(f"log formatting failed for {record.name}: {error}")
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+# ==================== SETUP ====================
+_queue_handler = None
+_listener = None
+
+
+def configure_logging(level=LOG_LEVEL, log_format=LOG_FORMAT, sample_rate=LOG_INFO_SAMPLE_RATE, stream=None):
+    """
+    🛠️ Route all logging through the background queue (idempotent)
+
+    Args:
+        level (str): Root log level
+        log_format (str): "json" or "text"
+        sample_rate (float): Share of INFO/DEBUG records kept
+        stream (file): Output stream (default: stdout)
+
+    Returns:
+        NonBlockingQueueHandler: The installed handler (exposes dropped/sampled_out counters)
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
+
+    if log_format == "text":
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+    else:
+        formatter = JsonFormatter()
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = NonBlockingQueueHandler(log_queue, sample_rate)
+    _listener = BatchingListener(log_queue, formatter, stream or sys.stdout)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    # ⚡ Neither formatter prints caller file/line or process details, so skip collecting them
+    logging._srcfile = None
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    return _queue_handler
+
+
+# ==================== FLASK INTEGRATION ====================
+class RequestLogger:
+    """
+    📋 Flask hooks that assign request ids and write one access log line per request
+
+    Args:
+        app (Flask): Application to hook
+        stage_sources (callable): Returns extra stage durations in seconds
+            (e.g. model and queue time) for the current request
+
+    Usage:
+        request_logger = RequestLogger(app, stage_sources=lambda: {"model": model_timer.total()})
+    """
+
+    def __init__(self, app=None, stage_sources=None):
+        self.stage_sources = stage_sources
+        self.logger = logging.getLogger("access")
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        ⚙️ Register before/after hooks on the application
+        """
+        app.before_request(self.start_request)
+        app.after_request(self.log_request)
+        app.teardown_request(self.end_request)
+
+    def start_request(self):
+        """
+        🆔 Before-request hook: adopt or create the request id and reset stage timers
+        """
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        # 🎲 Ids only need to be unique, not unguessable; getrandbits avoids a urandom syscall per request
+        request_id = incoming if 0 < len(incoming) <= 64 and incoming.isprintable() else f"{random.getrandbits(128):032x}"
+        g.request_id = request_id
+        g.request_log_started = time.perf_counter()
+        _request_id.set(request_id)
+        _stages.set({})
+
+    def log_request(self, response):
+        """
+        📋 After-request hook: echo the request id and log status, duration and stages
+        """
+        if "request_log_started" not in g:
+            return response
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+        stages = dict(_stages.get() or {})
+        if self.stage_sources is not None:
+            stages.update(self.stage_sources())
+        duration = time.perf_counter() - g.request_log_started
+        level = logging.WARNING if response.status_code >= 500 else logging.INFO
+        self.logger.log(level, f"{request.method} {request.path} {response.status_code}", extra={
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in stages.items()},
+        })
+        return response
+
+    def end_request(self, error=None):
+        """
+        🧹 Teardown hook: clear the request id so later logs on this thread are not mislabelled
+        """
+        _request_id.set(None)
+        _stages.set(None)
+
+    def snapshot(self):
+        """
+        📊 Logging pipeline counters
+        """
+        handler = _queue_handler
+        if handler is None:
+            return {"configured": False}
+        return {
+            "configured": True,
+            "queued": handler.queue.qsize(),
+            "dropped": handler.dropped,
+            "sampled_out": handler.sampled_out,
+            "info_sample_rate": handler.sample_rate,
+        }
@@ -0,0 +1,84 @@
+"""
+Tests for the outbound LLM rate-limit scheduler
+
+Run from the backend directory:
+    python -m pytest -q tests
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_groq_server
+from llm_backends import create_llm
+from llm_scheduler import LLMCapacityError, RateLimitScheduler
+
+
+# ==================== UPSTREAM 429 HANDLING ====================
+class UpstreamRateLimitTest(unittest.TestCase):
+    """
+    🚥 A provider 429 must surface as LLMCapacityError instead of being retried in the SDK
+    """
+
+    def setUp(self):
+        # One request per minute upstream, so the second call is answered with 429 + retry-after ~60s
+        self.server = fake_groq_server.create_server(port=0, requests_per_minute=1, latency=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        previous_base = os.environ.get("GROQ_API_BASE")
+        os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.addCleanup(self._restore_env, "GROQ_API_BASE", previous_base)
+
+        self.scheduler = RateLimitScheduler(requests_per_minute=1000, tokens_per_minute=10**6, max_wait=5)
+        self.llm = create_llm("fake-model", api_key="test-key", backend="groq",
+                              response_hooks=[self.scheduler.observe_response])
+
+    @staticmethod
+    def _restore_env(name, value):
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+    def test_http_429_raises_capacity_error_quickly(self):
+        self.scheduler.call(lambda: self.llm.invoke("first"), 10)
+
+        started = time.monotonic()
+        with self.assertRaises(LLMCapacityError) as raised:
+            self.scheduler.call(lambda: self.llm.invoke("second"), 10)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertGreater(raised.exception.retry_after, 1)
+
+        # ⛔ The provider's retry-after now blocks further calls, which are shed without being sent
+        with self.assertRaises(LLMCapacityError):
+            self.scheduler.call(lambda: self.llm.invoke("third"), 10)
+        snapshot = self.scheduler.snapshot()
+        self.assertEqual(snapshot["rate_limited"], 1)
+        self.assertEqual(snapshot["shed"], 1)
+
+
+# ==================== LOCAL BACKENDS ====================
+class UnenforcedLimitsTest(unittest.TestCase):
+    """
+    🏠 Local backends have no provider quota, so nothing is delayed or shed
+    """
+
+    def test_calls_beyond_the_groq_budget_are_admitted_immediately(self):
+        scheduler = RateLimitScheduler(requests_per_minute=1, tokens_per_minute=100, max_wait=0.1, enforce_limits=False)
+        started = time.monotonic()
+        for _ in range(20):
+            self.assertEqual(scheduler.call(lambda: "ok", 800), "ok")
+        self.assertLess(time.monotonic() - started, 1)
+        snapshot = scheduler.snapshot()
+        self.assertEqual((snapshot["admitted"], snapshot["delayed"], snapshot["shed"]), (20, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for the structured JSON log format
+
+Run from the backend directory:
+    python -m pytest -q tests
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from structured_logging import JsonFormatter
+
+
+# ==================== TIMESTAMPS ====================
+class JsonTimestampTest(unittest.TestCase):
+    """
+    🕒 "ts" is UTC whatever the host's local time zone is
+    """
+
+    def setUp(self):
+        if not hasattr(time, "tzset"):
+            self.skipTest("time.tzset() is not available on this platform")
+        previous_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Asia/Kolkata"
+        time.tzset()
+        self.addCleanup(self._restore_tz, previous_tz)
+
+    @staticmethod
+    def _restore_tz(value):
+        if value is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = value
+        time.tzset()
+
+    def test_timestamp_is_utc_under_a_non_utc_zone(self):
+        self.assertNotEqual(time.localtime(0).tm_hour, 0)          # The zone really is offset from UTC
+        record = logging.makeLogRecord({"msg": "hello", "levelname": "INFO", "created": 1_700_000_000.25, "msecs": 250})
+        entry = json.loads(JsonFormatter().format(record))
+        expected = datetime.fromtimestamp(record.created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.250Z")
+        self.assertEqual(entry["ts"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
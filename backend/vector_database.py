@@ -8,20 +8,34 @@ This module provides core functionality for:
 - Processing various legal queries using RAG (Retrieval Augmented Generation)
 - Handling contract simplification, content safety analysis, and invoice generation
 
-The module uses LangChain components with Groq LLM and Ollama embeddings.
+The module uses LangChain components with Groq LLM and Ollama embeddings by default;
+set LLM_BACKEND=fake and EMBEDDINGS_BACKEND=hash to run fully offline (see llm_backends.py).
 """
 
 # ==================== IMPORT STATEMENTS ====================
 # Standard library and third-party imports organized for clarity
-from langchain_groq import ChatGroq
-from langchain_ollama import OllamaEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
 from pydantic import SecretStr
+from llm_scheduler import RateLimitScheduler, LLMCapacityError, estimate_tokens, LLM_COMPLETION_TOKEN_ESTIMATE
+from llm_backends import create_llm, create_embeddings, model_timer, LLM_BACKEND, EMBEDDINGS_BACKEND
+from clause_cache import ClauseCache, segment_clauses
+from vector_namespaces import NamespacedVectorStore
+from vector_shards import ShardedVectorClient
+from answer_index import AnswerIndex, vector_store_version
+from ama_sessions import format_turns, trim_text, AMA_RECENT_TURNS, AMA_TURN_MAX_CHARACTERS, AMA_SUMMARY_MAX_CHARACTERS
+from structured_logging import timed_stage
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
 import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
 
 # ==================== ENVIRONMENT SETUP ====================
 # 🎯 Load environment variables from .env file
@@ -32,14 +46,25 @@ load_dotenv()
 FAISS_VECTOR_STORE_PATH = "vectorstore/db_faiss"           # Path to FAISS vector store
 OLLAMA_EMBEDDINGS_MODEL = "deepseek-r1:1.5b"               # Embedding model identifier
 GROQ_LLM_MODEL_NAME = "deepseek-r1-distill-llama-70b"      # LLM model for processing
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "local")         # "local" or "sharded" (see vector_shards.py)
+CLAUSE_ANALYSIS_WORKERS = int(os.getenv("CLAUSE_ANALYSIS_WORKERS", "4"))   # Parallel LLM calls for changed clauses
+POLICY_NAMESPACES = ("youtube_policy",)                                      # Corpora searched for policy questions
+LEGAL_ASSISTANT_NAMESPACES = tuple(                                          # Corpora searched (in parallel) for AMA
+    os.getenv("LEGAL_ASSISTANT_NAMESPACES", "contract_law,tax_gst,youtube_policy").split(",")
+)
 
 # ==================== LLM INITIALIZATION ====================
+# 🚥 Shared scheduler keeps outbound calls within Groq's request/token-per-minute limits
+# (the offline fake model has no provider quota, so its calls are only counted)
+llm_scheduler = RateLimitScheduler(enforce_limits=LLM_BACKEND == "groq")
+
 # 🚀 Initialize LLM with enhanced configuration for optimal performance
 api_key = os.getenv("GROQ_API_KEY")
-llm_model = ChatGroq(
+llm_model = create_llm(
+    GROQ_LLM_MODEL_NAME,                       # 🧠 Model selection for processing
     api_key=SecretStr(api_key) if api_key else None,         # 🔐 API key from environment variables
-    model=GROQ_LLM_MODEL_NAME,                 # 🧠 Model selection for processing
-    temperature=0.2                            # 🎯 Low temperature for consistent outputs
+    temperature=0.2,                           # 🎯 Low temperature for consistent outputs
+    response_hooks=[llm_scheduler.observe_response]          # 📥 Rate-limit header feedback
 )
 
 # ==================== DATABASE LOADING FUNCTION ====================
@@ -50,14 +75,22 @@ def load_faiss_database():
     This function loads the pre-built FAISS vector database from disk
     and initializes it with the appropriate embedding engine.
     
+    With VECTOR_SEARCH_BACKEND=sharded the store is not loaded into this
+    process; a client for the shard processes (vector_shards.py) is returned
+    instead and queries are only embedded here.
+    
     Returns:
-        FAISS: Loaded vector database instance ready for similarity searches
+        FAISS | ShardedVectorClient: Loaded vector database instance, or shard client
         
     Raises:
         Exception: If database loading fails due to file or configuration issues
     """
     # 🎯 Initialize embedding engine with specified model
-    embedding_engine = OllamaEmbeddings(model=OLLAMA_EMBEDDINGS_MODEL)
+    embedding_engine = create_embeddings(OLLAMA_EMBEDDINGS_MODEL)
+    
+    # 🛰️ Search runs in separate shard processes, possibly on other machines
+    if VECTOR_SEARCH_BACKEND == "sharded":
+        return ShardedVectorClient(embedding_engine)
     
     # 🚀 Load FAISS database from persistent storage
     return FAISS.load_local(
@@ -70,6 +103,21 @@ def load_faiss_database():
 # 🔄 Initialize database connection at module level for reuse
 vector_database = load_faiss_database()
 
+# 🗂️ Per-corpus sub-indexes so each handler searches only its own namespaces (shards keep their own)
+if isinstance(vector_database, ShardedVectorClient):
+    namespaced_store = vector_database
+    store_version = vector_database.version()
+else:
+    namespaced_store = NamespacedVectorStore(vector_database)
+    store_version = vector_store_version(FAISS_VECTOR_STORE_PATH)
+
+# 📚 Precomputed answers for canonical questions, valid only for this exact store version, LLM and
+# embedder (question embeddings from different embedders must never be compared)
+answer_index = AnswerIndex(
+    store_version,
+    f"{LLM_BACKEND}:{GROQ_LLM_MODEL_NAME}|{EMBEDDINGS_BACKEND}:{OLLAMA_EMBEDDINGS_MODEL}",
+)
+
 # ==================== PROMPT CHAIN UTILITY ====================
 def create_prompt_chain(prompt_template):
     """
@@ -92,36 +140,172 @@ def create_prompt_chain(prompt_template):
     # 🔄 Return processing chain: prompt -> LLM -> string parser
     return prompt_structure | llm_model | StrOutputParser()
 
-# ==================== CONTRACT SIMPLIFICATION SERVICE ====================
-def simplify_contract_text(contract_content):
+# ==================== RATE-LIMITED CHAIN EXECUTION ====================
+def run_prompt_chain(prompt_template, inputs):
     """
-    📄 Simplify legal contract text for content creators
+    🚥 Build and invoke a prompt chain within the outbound LLM rate limits
     
-    Takes complex legal language and converts it to plain, understandable terms
-    specifically tailored for YouTube content creators.
+    Estimates the prompt size before sending so the token budget is reserved
+    up front; bursts are smoothed and calls that would wait too long are shed.
     
     Args:
-        contract_content (str): Raw legal contract text to be simplified
+        prompt_template (str): Template string with placeholders for dynamic content
+        inputs (dict): Values for the template placeholders
         
     Returns:
-        str: Simplified explanation of the contract terms and implications
+        str: Parsed LLM output
+        
+    Raises:
+        LLMCapacityError: If the rate-limit budget cannot be met in time
     """
-    # 📝 Template for contract simplification with clear structure
-    contract_template = """
-    Analyze and simplify the following contract text for content creators. 
-    Provide clear, accurate, and concise explanations:
+    processing_chain = create_prompt_chain(prompt_template)
+    prompt_text = prompt_template + "".join(str(value) for value in inputs.values())
+    estimated_tokens = estimate_tokens(prompt_text) + LLM_COMPLETION_TOKEN_ESTIMATE
+    return llm_scheduler.call(lambda: processing_chain.invoke(inputs), estimated_tokens)
 
-    Contract Content:
+# ==================== CONTRACT SIMPLIFICATION SERVICE ====================
+# 📝 Template for clause-by-clause contract simplification; clauses are batched under markers
+CLAUSE_ANALYSIS_TEMPLATE = """
+    Analyze and simplify each of the following contract clauses for content creators.
+    For every clause, provide a clear, accurate, and concise explanation of what it requires,
+    any risks for the creator, and anything worth negotiating.
+    Start each explanation with the clause's marker line exactly as given (for example [[CLAUSE 1]]).
+
+    Contract Clauses:
     {text}
 
     Simplified Analysis:
     """
+CLAUSE_MARKER = "[[CLAUSE {number}]]"
+CLAUSE_MARKER_PATTERN = re.compile(r"\[\[CLAUSE (\d+)\]\]")
+CLAUSE_BATCH_CHARACTERS = int(os.getenv("CLAUSE_BATCH_CHARACTERS", "8000"))   # Clause text per LLM call
+
+# 🗄️ Persistent per-clause results; the version ties entries to the backend, model and prompt
+clause_cache = ClauseCache(version=hashlib.sha256(
+    f"{LLM_BACKEND}:{GROQ_LLM_MODEL_NAME}:{CLAUSE_ANALYSIS_TEMPLATE}".encode("utf-8")
+).hexdigest()[:16])
+
+def _batch_clauses(clause_texts):
+    """
+    📦 Group clause texts into batches of roughly CLAUSE_BATCH_CHARACTERS
+    """
+    batches, current, size = [], [], 0
+    for clause_hash, text in clause_texts:
+        if current and size + len(text) > CLAUSE_BATCH_CHARACTERS:
+            batches.append(current)
+            current, size = [], 0
+        current.append((clause_hash, text))
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+def _analyze_clause_batch(batch):
+    """
+    🧠 Analyze a batch of clauses in one LLM call and split the answer per clause
+    
+    Args:
+        batch (list): (clause hash, clause text) pairs
+        
+    Returns:
+        tuple: (clause hash -> analysis, list of clauses whose marker was missing)
+    """
+    marked_text = "\n\n".join(
+        f"{CLAUSE_MARKER.format(number=number)}\n{text}" for number, (_, text) in enumerate(batch, start=1)
+    )
+    output = run_prompt_chain(CLAUSE_ANALYSIS_TEMPLATE, {"text": marked_text})
+
+    # ✂️ Split "[[CLAUSE n]] ..." sections back onto their clauses
+    sections = CLAUSE_MARKER_PATTERN.split(output)
+    by_number = {int(number): body.strip() for number, body in zip(sections[1::2], sections[2::2]) if body.strip()}
+    if len(batch) == 1 and 1 not in by_number:
+        by_number[1] = output.strip()
+
+    analyses, missing = {}, []
+    for number, (clause_hash, text) in enumerate(batch, start=1):
+        if number in by_number:
+            analyses[clause_hash] = by_number[number]
+        else:
+            missing.append((clause_hash, text))
+    return analyses, missing
+
+def analyze_contract_clauses(contract_content):
+    """
+    📑 Simplify a contract clause by clause, re-analyzing only changed clauses
     
-    # ⚙️ Create processing chain for contract simplification
-    processing_chain = create_prompt_chain(contract_template)
+    Each clause is hashed (ignoring its numbering); analyses of clauses seen in
+    earlier submissions come from the clause cache, and only new or edited
+    clauses are sent to the LLM, batched and in parallel.
     
-    # 🚀 Execute processing chain with provided content
-    return processing_chain.invoke({"text": contract_content})
+    Args:
+        contract_content (str): Raw legal contract text to be simplified
+        
+    Returns:
+        dict: "summary" (combined analysis), "clauses" (per-clause label, hash,
+              changed flag and analysis) and "clause_cache" (hit/miss counts)
+    """
+    # ✂️ Segment the contract and look up clauses analyzed before
+    clauses = segment_clauses(contract_content)
+    with timed_stage("clause_cache"):
+        analyses = clause_cache.get_many([clause["hash"] for clause in clauses])
+    cached_hashes = set(analyses)
+    clause_texts = {clause["hash"]: clause["text"] for clause in clauses}
+    pending = [(clause_hash, text) for clause_hash, text in clause_texts.items() if clause_hash not in cached_hashes]
+
+    # 🚀 Analyze only new or edited clauses; each finished batch is cached immediately
+    if pending:
+        batches = _batch_clauses(pending)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CLAUSE_ANALYSIS_WORKERS) as pool:
+            futures = [pool.submit(_analyze_clause_batch, batch) for batch in batches]
+            while futures:
+                batch_analyses, missing = futures.pop(0).result()
+                for clause_hash, analysis in batch_analyses.items():
+                    analyses[clause_hash] = analysis
+                    clause_cache.put(clause_hash, analysis)
+                # 🔁 Clauses the model skipped in a batch are retried individually
+                futures.extend(pool.submit(_analyze_clause_batch, [clause]) for clause in missing)
+        # ⏱️ Worker threads keep their own model timers; charge the parallel phase to this request
+        model_timer.add(time.perf_counter() - started)
+
+    clause_results = []
+    for index, clause in enumerate(clauses, start=1):
+        label = clause["label"] or f"Part {index}"
+        if label[0].isdigit():
+            label = f"Clause {label}"
+        clause_results.append({
+            "index": index,
+            "label": label,
+            "hash": clause["hash"][:16],
+            "changed": clause["hash"] not in cached_hashes,
+            "analysis": analyses[clause["hash"]],
+        })
+
+    return {
+        "summary": "\n\n".join(f"{result['label']}: {result['analysis']}" for result in clause_results),
+        "clauses": clause_results,
+        "clause_cache": {
+            "clauses": len(clauses),
+            "hits": sum(not result["changed"] for result in clause_results),
+            "analyzed": len(pending),
+        },
+    }
+
+def simplify_contract_text(contract_content):
+    """
+    📄 Simplify legal contract text for content creators
+    
+    Takes complex legal language and converts it to plain, understandable terms
+    specifically tailored for YouTube content creators.
+    
+    Args:
+        contract_content (str): Raw legal contract text to be simplified
+        
+    Returns:
+        str: Simplified explanation of the contract terms and implications
+    """
+    # 🚀 Clause-level analysis with caching of unchanged clauses
+    return analyze_contract_clauses(contract_content)["summary"]
 
 # ==================== CONTENT SAFETY ANALYSIS ====================
 def analyze_content_safety(content_text):
@@ -152,11 +336,8 @@ def analyze_content_safety(content_text):
     Safety Assessment:
     """
     
-    # ⚙️ Create analysis chain for content safety evaluation
-    analysis_chain = create_prompt_chain(safety_template)
-    
     # 🚀 Execute safety analysis with provided content
-    return analysis_chain.invoke({"text": content_text})
+    return run_prompt_chain(safety_template, {"text": content_text})
 
 # ==================== PROFESSIONAL INVOICE GENERATION ====================
 def create_professional_invoice(brand_name, service_description, amount_value, include_gst_tax):
@@ -194,7 +375,7 @@ def create_professional_invoice(brand_name, service_description, amount_value, i
     return invoice_template
 
 # ==================== YOUTUBE POLICY QUERY HANDLER ====================
-def handle_policy_query(user_question):
+def handle_policy_query(user_question, query_vector=None):
     """
     📺 Process YouTube policy questions using RAG pipeline
     
@@ -204,12 +385,14 @@ def handle_policy_query(user_question):
     
     Args:
         user_question (str): User's question about YouTube policies
+        query_vector (array): Question embedding, if the caller already computed it
         
     Returns:
         str: Expert response based on retrieved policy context
     """
-    # 🔍 Retrieve relevant documents from vector database
-    relevant_docs = vector_database.similarity_search(user_question)
+    # 🔍 Retrieve relevant documents from the YouTube policy corpus only
+    with timed_stage("retrieval"):
+        relevant_docs = namespaced_store.search(user_question, POLICY_NAMESPACES, query_vector=query_vector)
     
     # 📚 Combine document contents for context
     context_data = "\n\n".join([doc.page_content for doc in relevant_docs])
@@ -226,11 +409,32 @@ def handle_policy_query(user_question):
     Expert Response:
     """
     
-    # ⚙️ Create policy response chain
-    policy_chain = create_prompt_chain(policy_template)
-    
     # 🚀 Generate response using retrieved context
-    return policy_chain.invoke({"question": user_question, "context": context_data})
+    return run_prompt_chain(policy_template, {"question": user_question, "context": context_data})
+
+def answer_policy_question(user_question):
+    """
+    ⚡ Serve a policy question from the precomputed answer index, or run the RAG pipeline
+    
+    Exact text matches cost no embedding; otherwise the question is embedded once
+    and that vector is reused for retrieval when the index has no close match.
+    
+    Args:
+        user_question (str): User's question about YouTube policies
+        
+    Returns:
+        dict: "answer", plus "precomputed" (matched question, similarity and
+              index version) when served from the index
+    """
+    with timed_stage("answer_index"):
+        hit = answer_index.match_text(user_question)
+        query_vector = None
+        if hit is None and answer_index.has_answers():
+            query_vector = namespaced_store.embed(user_question)
+            hit = answer_index.match_vector(query_vector)
+    if hit is not None:
+        return hit
+    return {"answer": handle_policy_query(user_question, query_vector=query_vector)}
 
 # ==================== LEGAL ASSISTANT QUERY HANDLER ====================
 def process_legal_assistant_query(user_query):
@@ -246,8 +450,9 @@ def process_legal_assistant_query(user_query):
     Returns:
         str: Personalized legal assistance response
     """
-    # 🔍 Retrieve relevant legal documents from vector database
-    retrieved_documents = vector_database.similarity_search(user_query)
+    # 🔍 Retrieve relevant legal documents from the legal assistant corpora
+    with timed_stage("retrieval"):
+        retrieved_documents = namespaced_store.search(user_query, LEGAL_ASSISTANT_NAMESPACES)
     
     # 📚 Compile context from retrieved documents
     document_context = "\n\n".join([doc.page_content for doc in retrieved_documents])
@@ -264,11 +469,127 @@ def process_legal_assistant_query(user_query):
     Assistant Response:
     """
     
-    # ⚙️ Create assistant response chain
-    assistant_chain = create_prompt_chain(assistant_template)
-    
     # 🚀 Generate personalized legal response
-    return assistant_chain.invoke({"question": user_query, "context": document_context})
+    return run_prompt_chain(assistant_template, {"question": user_query, "context": document_context})
+
+# ==================== MULTI-TURN LEGAL ASSISTANT ====================
+# 📝 Turns a follow-up into a self-contained question so retrieval ignores stale conversation text
+CONDENSE_QUESTION_TEMPLATE = """
+    Rewrite the creator's follow-up as one standalone question that can be understood
+    without the conversation. Return only the question.
+
+    Conversation Summary: {summary}
+    Recent Turns:
+    {history}
+
+    Follow-up: {question}
+
+    Standalone Question:
+    """
+
+# 📝 Folds turns that leave the verbatim window into the running summary
+CONVERSATION_SUMMARY_TEMPLATE = """
+    Update the running summary of a legal conversation with a content creator.
+    Keep facts the creator shared (deals, brands, amounts, platforms, deadlines) and the advice given.
+    Use at most {max_words} words.
+
+    Current Summary: {summary}
+    Turns to Add:
+    {history}
+
+    Updated Summary:
+    """
+
+# 📝 Legal assistant persona with bounded conversation memory
+SESSION_ASSISTANT_TEMPLATE = """
+    You are Rohit Advocate, a legal AI assistant specializing in YouTube and content creator legal matters.
+    Provide helpful, accurate responses based on the available legal context and the conversation so far.
+
+    Conversation Summary: {summary}
+    Recent Turns:
+    {history}
+
+    Creator Question: {question}
+    Legal Context:
+    {context}
+
+    Assistant Response:
+    """
+
+
+def process_legal_assistant_turn(user_query, session):
+    """
+    💬 Answer one turn of a multi-turn AMA conversation
+    
+    Follow-ups are condensed into a standalone question for retrieval; the answer
+    prompt carries only the running summary plus the last few turns, so its size
+    stays flat however long the conversation runs. The session dict is updated in
+    place (new turn appended, overflow folded into the summary); the caller saves it.
+    
+    Args:
+        user_query (str): Creator's question for this turn
+        session (dict): Session from SessionStore.load()
+        
+    Returns:
+        dict: answer, standalone_question, prompt_tokens (answer prompt) and
+              total_prompt_tokens (all LLM calls made for this turn)
+        
+    Raises:
+        LLMCapacityError: If the condense or answer call cannot be scheduled
+    """
+    question = trim_text(user_query, AMA_TURN_MAX_CHARACTERS)
+    history = format_turns(session["turns"][-AMA_RECENT_TURNS:])
+    summary = session["summary"] or "(none)"
+    total_prompt_tokens = 0
+
+    # 🔁 Condense follow-ups so retrieval is driven by the actual question, not the transcript
+    standalone_question = question
+    if session["summary"] or session["turns"]:
+        condense_inputs = {"summary": summary, "history": history, "question": question}
+        total_prompt_tokens += estimate_tokens(CONDENSE_QUESTION_TEMPLATE + "".join(condense_inputs.values()))
+        condensed = run_prompt_chain(CONDENSE_QUESTION_TEMPLATE, condense_inputs).strip()
+        standalone_question = trim_text(condensed, AMA_TURN_MAX_CHARACTERS) or question
+
+    # 🔍 Retrieve legal context for the standalone question
+    with timed_stage("retrieval"):
+        retrieved_documents = namespaced_store.search(standalone_question, LEGAL_ASSISTANT_NAMESPACES)
+    document_context = "\n\n".join([doc.page_content for doc in retrieved_documents])
+
+    # 🚀 Answer with bounded memory
+    answer_inputs = {"summary": summary, "history": history, "question": question, "context": document_context}
+    prompt_tokens = estimate_tokens(SESSION_ASSISTANT_TEMPLATE + "".join(answer_inputs.values()))
+    total_prompt_tokens += prompt_tokens
+    answer = run_prompt_chain(SESSION_ASSISTANT_TEMPLATE, answer_inputs)
+
+    session["turns"].append({
+        "question": question,
+        "answer": trim_text(answer, AMA_TURN_MAX_CHARACTERS),
+    })
+    session["turn_count"] += 1
+
+    # 🧠 Roll turns beyond the verbatim window into the running summary
+    overflow = session["turns"][:-AMA_RECENT_TURNS]
+    if overflow:
+        summary_inputs = {
+            "summary": summary,
+            "history": format_turns(overflow),
+            "max_words": str(AMA_SUMMARY_MAX_CHARACTERS // 6),
+        }
+        try:
+            total_prompt_tokens += estimate_tokens(CONVERSATION_SUMMARY_TEMPLATE + "".join(summary_inputs.values()))
+            updated_summary = run_prompt_chain(CONVERSATION_SUMMARY_TEMPLATE, summary_inputs)
+            session["summary"] = trim_text(updated_summary, AMA_SUMMARY_MAX_CHARACTERS)
+            session["turns"] = session["turns"][-AMA_RECENT_TURNS:]
+        except LLMCapacityError:
+            # ⏳ Keep the answer; fold the overflow on a later turn (the window is capped meanwhile)
+            session["turns"] = session["turns"][-AMA_RECENT_TURNS * 3:]
+
+    return {
+        "answer": answer,
+        "standalone_question": standalone_question,
+        "prompt_tokens": prompt_tokens,
+        "total_prompt_tokens": total_prompt_tokens,
+    }
 
 # ==================== MONITORING AND LOGGING UTILITIES ====================
 def log_processing_status(function_name, status="completed"):
@@ -285,11 +606,8 @@ def log_processing_status(function_name, status="completed"):
     Returns:
         bool: Always returns True for successful logging
     """
-    # 🎨 Print formatted status message for monitoring
-    print(f"[📊] {function_name} execution {status}")
-    
-    # 🎯 TODO: Replace with structured logging in production
-    # Enhancement idea: Integrate with centralized logging system
+    # 📋 Structured, non-blocking log record (see structured_logging.py)
+    logger.info(f"{function_name} execution {status}", extra={"function": function_name, "status": status})
     return True
 
 # ==================== FUTURE ENHANCEMENT PLACEHOLDER ====================
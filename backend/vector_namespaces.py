@@ -0,0 +1,240 @@
+"""
+Namespaced Vector Search for YouTube Legal Advisor AI Bot
+========================================================
+
+The FAISS store holds several corpora (YouTube policy, Indian contract law,
+tax/GST). Searching all of them for every question wastes context tokens on
+chunks from the wrong corpus. This module:
+- Assigns every stored chunk to a namespace (its "namespace" metadata, or a
+  keyword match on its source file for chunks ingested before namespaces existed)
+- Builds one FAISS sub-index per namespace from the stored vectors, so a search
+  only scans its own corpus
+- Fans a query out across several namespaces in parallel and merges hits by score
+- Ingests new documents into a namespace from the command line
+
+Usage:
+    python vector_namespaces.py --namespace contract_law indian-contract-act.pdf
+    (precomputed FAQ answers are rebuilt afterwards; see answer_index.py)
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from concurrent.futures import ThreadPoolExecutor
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+import argparse
+import faiss
+import logging
+import numpy as np
+import os
+import subprocess
+import sys
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+NAMESPACES = ("youtube_policy", "contract_law", "tax_gst")
+DEFAULT_NAMESPACE = "youtube_policy"                 # The corpus shipped before namespaces existed
+VECTOR_SEARCH_K = 4                                  # Chunks returned per query (LangChain's default)
+VECTOR_FANOUT_WORKERS = int(os.getenv("VECTOR_FANOUT_WORKERS", str(len(NAMESPACES))))
+INGEST_CHUNK_SIZE = 1000                             # Characters per stored chunk
+INGEST_CHUNK_OVERLAP = 200
+
+# Untagged chunks are assigned by keywords in their source file name, checked in this order
+NAMESPACE_SOURCE_KEYWORDS = (
+    ("tax_gst", ("gst", "tax", "income")),
+    ("contract_law", ("contract", "agreement", "specific-relief")),
+    ("youtube_policy", ("youtube", "guideline", "policy")),
+)
+
+
+# ==================== NAMESPACE ASSIGNMENT ====================
+def namespace_for(metadata):
+    """
+    🏷️ Work out which corpus a stored chunk belongs to
+
+    Args:
+        metadata (dict): Chunk metadata from the docstore
+
+    Returns:
+        str: Namespace name
+    """
+    if metadata.get("namespace"):
+        return metadata["namespace"]
+    source = f"{metadata.get('source', '')} {metadata.get('file_path', '')}".lower()
+    for namespace, keywords in NAMESPACE_SOURCE_KEYWORDS:
+        if any(keyword in source for keyword in keywords):
+            return namespace
+    return DEFAULT_NAMESPACE
+
+
+# ==================== NAMESPACED STORE ====================
+class NamespacedVectorStore:
+    """
+    🗂️ Per-namespace FAISS sub-indexes over a loaded LangChain FAISS store
+
+    Args:
+        store (FAISS): Loaded vector store (flat index, so vectors can be reconstructed)
+        workers (int): Threads used to fan a query out across namespaces
+    """
+
+    def __init__(self, store, workers=VECTOR_FANOUT_WORKERS):
+        self.store = store
+        self.workers = workers
+        self.higher_is_better = store.distance_strategy in (
+            DistanceStrategy.MAX_INNER_PRODUCT, DistanceStrategy.JACCARD,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vector-fanout") if workers > 1 else None
+        self.indexes = {}
+        self.docstore_ids = {}
+        self._build_sub_indexes()
+
+    def _build_sub_indexes(self):
+        """
+        🔨 Split the store's vectors into one flat index per namespace
+        """
+        index = self.store.index
+        vectors = index.reconstruct_n(0, index.ntotal) if index.ntotal else None
+        positions = {}
+        for position in range(index.ntotal):
+            document = self.store.docstore.search(self.store.index_to_docstore_id[position])
+            positions.setdefault(namespace_for(document.metadata), []).append(position)
+
+        for namespace, members in positions.items():
+            sub_index = faiss.IndexFlat(index.d, index.metric_type)
+            sub_index.add(vectors[members])
+            self.indexes[namespace] = sub_index
+            self.docstore_ids[namespace] = [self.store.index_to_docstore_id[position] for position in members]
+        logger.info(f"Vector namespaces: {', '.join(f'{name}={len(ids)}' for name, ids in self.docstore_ids.items())}")
+
+    def _search_namespace(self, namespace, vector, k):
+        sub_index = self.indexes.get(namespace)
+        if sub_index is None:
+            return []
+        scores, positions = sub_index.search(vector, min(k, sub_index.ntotal))
+        return [
+            (self.store.docstore.search(self.docstore_ids[namespace][position]), float(score))
+            for score, position in zip(scores[0], positions[0]) if position >= 0
+        ]
+
+    def embed(self, query):
+        """
+        🧮 Embed a query the way the store does (normalised if the store is)
+
+        Returns:
+            array: float32 matrix of shape (1, dimension)
+        """
+        vector = np.array([self.store._embed_query(query)], dtype=np.float32)
+        if self.store._normalize_L2:
+            faiss.normalize_L2(vector)
+        return vector
+
+    def search_with_scores(self, query, namespaces, k=VECTOR_SEARCH_K, query_vector=None):
+        """
+        🔍 Search only the given namespaces, merging hits by score
+
+        Args:
+            query (str): Search text
+            namespaces (tuple): Namespaces to search; several are searched in parallel
+            k (int): Number of chunks to return overall
+            query_vector (array): Precomputed embed(query), to avoid embedding twice
+
+        Returns:
+            list: (Document, score) pairs, best first
+        """
+        vector = query_vector if query_vector is not None else self.embed(query)
+        live = [namespace for namespace in namespaces if namespace in self.indexes]
+        if len(live) <= 1 or self._executor is None:
+            hits = [hit for namespace in live for hit in self._search_namespace(namespace, vector, k)]
+        else:
+            results = self._executor.map(lambda namespace: self._search_namespace(namespace, vector, k), live)
+            hits = [hit for namespace_hits in results for hit in namespace_hits]
+        hits.sort(key=lambda hit: hit[1], reverse=self.higher_is_better)
+        return hits[:k]
+
+    def search(self, query, namespaces, k=VECTOR_SEARCH_K, query_vector=None):
+        """
+        🔍 Like search_with_scores(), returning only the documents
+        """
+        return [document for document, _ in self.search_with_scores(query, namespaces, k, query_vector)]
+
+    def snapshot(self):
+        """
+        📊 Chunk counts per namespace
+        """
+        return {namespace: len(ids) for namespace, ids in self.docstore_ids.items()}
+
+
+# ==================== DOCUMENT INGESTION ====================
+def load_source_documents(path, namespace):
+    """
+    📄 Read a PDF or text file into one Document per page, tagged with its namespace
+
+    Args:
+        path (str): Source file
+        namespace (str): Corpus the file belongs to
+
+    Returns:
+        list: LangChain Documents
+    """
+    source = os.path.basename(path)
+    if path.lower().endswith(".pdf"):
+        import pdfplumber
+
+        with pdfplumber.open(path) as pdf:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+    else:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            pages = [handle.read()]
+    return [
+        Document(page_content=text, metadata={"source": source, "file_path": path, "page": number,
+                                              "total_pages": len(pages), "namespace": namespace})
+        for number, text in enumerate(pages) if text.strip()
+    ]
+
+
+def ingest_documents(store, paths, namespace):
+    """
+    📥 Chunk, embed and add source files to the store under one namespace
+
+    Args:
+        store (FAISS): Loaded vector store
+        paths (list): PDF or text files
+        namespace (str): One of NAMESPACES
+
+    Returns:
+        int: Number of chunks added
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=INGEST_CHUNK_SIZE, chunk_overlap=INGEST_CHUNK_OVERLAP, add_start_index=True,
+    )
+    chunks = splitter.split_documents([doc for path in paths for doc in load_source_documents(path, namespace)])
+    if chunks:
+        store.add_documents(chunks)
+    return len(chunks)
+
+
+# ==================== COMMAND LINE ====================
+if __name__ == "__main__":
+    from vector_database import FAISS_VECTOR_STORE_PATH, vector_database
+    from vector_shards import ShardedVectorClient, VECTOR_SHARD_DIR
+
+    parser = argparse.ArgumentParser(description="Add documents to a namespace of the FAISS vector store")
+    parser.add_argument("paths", nargs="+", help="PDF or text files to ingest")
+    parser.add_argument("--namespace", required=True, choices=NAMESPACES)
+    parser.add_argument("--store", default=FAISS_VECTOR_STORE_PATH, help="Directory to save the updated store")
+    parser.add_argument("--skip-precompute", action="store_true", help="Do not refresh precomputed FAQ answers")
+    args = parser.parse_args()
+    if isinstance(vector_database, ShardedVectorClient):
+        parser.error("ingest into the full store with VECTOR_SEARCH_BACKEND=local, then re-split it with vector_shards.py")
+
+    added = ingest_documents(vector_database, args.paths, args.namespace)
+    vector_database.save_local(args.store)
+    print(f"Added {added} chunks to '{args.namespace}'; namespaces now: {NamespacedVectorStore(vector_database, workers=1).snapshot()}")
+
+    # 🔁 Precomputed answers are tied to the store version, so rebuild them in a fresh process
+    if not args.skip_precompute and args.store == FAISS_VECTOR_STORE_PATH:
+        subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "answer_index.py")], check=True)
+
+    if os.path.isdir(VECTOR_SHARD_DIR):
+        print(f"Shards in {VECTOR_SHARD_DIR} are now stale: re-run vector_shards.py split and restart the shard servers")
@@ -0,0 +1,392 @@
+"""
+Sharded Vector Search Service for YouTube Legal Advisor AI Bot
+=============================================================
+
+By default every Flask process loads the whole FAISS store, so the corpus is
+capped by one worker's RAM and search cannot use more than one machine. This
+module runs vector search as a separate service instead:
+- Splits the saved store into N shards (round-robin, so every namespace is
+  spread evenly) with a manifest recording the store version they came from
+- Serves each shard from its own process over multiprocessing.connection
+  (authenticated with VECTOR_SHARD_AUTHKEY), on this machine or another one
+- A client with the same interface as NamespacedVectorStore embeds the query
+  once, asks every shard for its top k in parallel and merges the hits by score
+
+Enable it with VECTOR_SEARCH_BACKEND=sharded and VECTOR_SHARD_ADDRESSES; see
+load_faiss_database() in vector_database.py.
+
+Usage:
+    python vector_shards.py split --shards 4
+    VECTOR_SHARD_AUTHKEY=... python vector_shards.py start --shards 4
+    VECTOR_SHARD_AUTHKEY=... python vector_shards.py serve --shard-path vectorstore/shards/shard-0 --port 7400
+"""
+
+# ==================== IMPORT STATEMENTS ====================
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from answer_index import vector_store_version
+from vector_namespaces import NamespacedVectorStore, VECTOR_SEARCH_K
+import argparse
+import faiss
+import json
+import logging
+import multiprocessing
+import numpy as np
+import os
+import queue
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ==================== APPLICATION CONFIGURATION ====================
+VECTOR_SHARD_DIR = os.getenv("VECTOR_SHARD_DIR", "vectorstore/shards")
+VECTOR_SHARD_ADDRESSES = os.getenv("VECTOR_SHARD_ADDRESSES", "")              # "host:port,host:port"
+VECTOR_SHARD_AUTHKEY = os.getenv("VECTOR_SHARD_AUTHKEY", "")                  # Shared secret for shard connections
+VECTOR_SHARD_TIMEOUT = float(os.getenv("VECTOR_SHARD_TIMEOUT", "5"))          # Seconds to wait for one shard's reply
+VECTOR_SHARD_STARTUP_TIMEOUT = float(os.getenv("VECTOR_SHARD_STARTUP_TIMEOUT", "30"))   # Seconds to wait for shards at startup
+VECTOR_SHARD_BASE_PORT = 7400
+CLIENT_THREADS_PER_SHARD = 4              # Fan-out threads per shard, so concurrent requests do not queue behind each other
+MANIFEST_NAME = "manifest.json"
+
+_SHARD_DIRECTORY = re.compile(r"^shard-\d+$")
+
+
+class VectorShardError(RuntimeError):
+    """
+    🧩 A shard could not be reached or failed to answer
+    """
+
+
+def _authkey(authkey):
+    if not authkey:
+        raise VectorShardError("VECTOR_SHARD_AUTHKEY must be set to run or query vector shards")
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def _parse_address(address):
+    host, _, port = address.strip().rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+# ==================== SPLITTING ====================
+def split_store(store, shards, output_dir=VECTOR_SHARD_DIR, source_version=None):
+    """
+    ✂️ Write a loaded FAISS store out as N shard stores
+
+    Chunks are dealt round-robin so each shard holds an even slice of every namespace.
+
+    Args:
+        store (FAISS): Loaded store with a flat index (vectors can be reconstructed)
+        shards (int): Number of shards
+        output_dir (str): Directory receiving shard-0 ... shard-(N-1)
+        source_version (str): Version stamp of the store (see answer_index.vector_store_version)
+
+    Returns:
+        list: Paths of the written shard directories
+    """
+    index = store.index
+    vectors = index.reconstruct_n(0, index.ntotal) if index.ntotal else np.zeros((0, index.d), dtype=np.float32)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for shard in range(shards):
+        members = range(shard, index.ntotal, shards)
+        sub_index = faiss.IndexFlat(index.d, index.metric_type)
+        sub_index.add(vectors[shard::shards])
+        docstore_ids = [store.index_to_docstore_id[position] for position in members]
+        shard_store = FAISS(
+            store.embedding_function, sub_index,
+            InMemoryDocstore({docstore_id: store.docstore.search(docstore_id) for docstore_id in docstore_ids}),
+            dict(enumerate(docstore_ids)),
+        )
+        path = os.path.join(output_dir, f"shard-{shard}")
+        shard_store.save_local(path)
+        with open(os.path.join(path, MANIFEST_NAME), "w", encoding="utf-8") as handle:
+            json.dump({"shard": shard, "shards": shards, "chunks": len(docstore_ids),
+                       "source_version": source_version}, handle)
+        paths.append(path)
+
+    # 🧹 Shards left over from an earlier split with more shards would serve stale data
+    for name in os.listdir(output_dir):
+        if _SHARD_DIRECTORY.match(name) and int(name.split("-")[1]) >= shards:
+            shutil.rmtree(os.path.join(output_dir, name))
+    return paths
+
+
+# ==================== SHARD SERVER ====================
+class ShardServer:
+    """
+    🛰️ Serves searches over one shard store; one thread per client connection
+
+    Args:
+        shard_path (str): Directory written by split_store()
+        address (tuple): (host, port) to listen on
+        authkey (bytes): Shared secret clients must present
+    """
+
+    def __init__(self, shard_path, address, authkey=VECTOR_SHARD_AUTHKEY):
+        self.address = address
+        self.authkey = _authkey(authkey)
+        store = FAISS.load_local(shard_path, embeddings=None, allow_dangerous_deserialization=True)
+        self.store = NamespacedVectorStore(store, workers=1)
+        with open(os.path.join(shard_path, MANIFEST_NAME), encoding="utf-8") as handle:
+            self.manifest = json.load(handle)
+
+    def serve_forever(self):
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Vector shard {self.manifest['shard']}/{self.manifest['shards']} listening on "
+                        f"{self.address[0]}:{self.address[1]} ({self.store.snapshot()})")
+            while True:
+                try:
+                    connection = listener.accept()
+                except (OSError, multiprocessing.AuthenticationError) as error:
+                    logger.warning(f"Rejected shard connection: {error}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _serve_connection(self, connection):
+        with connection:
+            while True:
+                try:
+                    operation, arguments = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ("ok", self._dispatch(operation, arguments))
+                except Exception as error:
+                    logger.exception(f"Vector shard operation {operation!r} failed")
+                    reply = ("error", f"{type(error).__name__}: {error}")
+                try:
+                    connection.send(reply)
+                except (EOFError, OSError):
+                    # 🔌 The client timed out and hung up; the with block closes our end
+                    return
+
+    def _dispatch(self, operation, arguments):
+        if operation == "search":
+            vector, namespaces, k = arguments
+            return [(document.page_content, document.metadata, score)
+                    for document, score in self.store.search_with_scores(None, namespaces, k, query_vector=vector)]
+        if operation == "info":
+            return {
+                "manifest": self.manifest,
+                "namespaces": self.store.snapshot(),
+                "higher_is_better": self.store.higher_is_better,
+                "normalize_L2": self.store.store._normalize_L2,
+            }
+        raise ValueError(f"Unknown operation {operation!r}")
+
+
+# ==================== CLIENT ====================
+class ShardedVectorClient:
+    """
+    🔭 Drop-in replacement for NamespacedVectorStore that searches shard processes
+
+    Connections are pooled per shard and reused across requests. A shard that
+    fails or times out is logged and skipped, so a search degrades to the
+    remaining shards; it only fails when no shard answers.
+
+    Args:
+        embeddings (Embeddings): Embedding engine used to embed queries locally
+        addresses (list): "host:port" of every shard (default: VECTOR_SHARD_ADDRESSES)
+        authkey (str): Shared secret (default: VECTOR_SHARD_AUTHKEY)
+        timeout (float): Seconds to wait for one shard's reply
+    """
+
+    def __init__(self, embeddings, addresses=None, authkey=VECTOR_SHARD_AUTHKEY, timeout=VECTOR_SHARD_TIMEOUT,
+                 startup_timeout=VECTOR_SHARD_STARTUP_TIMEOUT):
+        addresses = addresses or [address for address in VECTOR_SHARD_ADDRESSES.split(",") if address.strip()]
+        if not addresses:
+            raise VectorShardError("VECTOR_SHARD_ADDRESSES lists no shards")
+        self.embeddings = embeddings
+        self.addresses = [_parse_address(address) for address in addresses]
+        self.authkey = _authkey(authkey)
+        self.timeout = timeout
+        self._idle = [queue.SimpleQueue() for _ in self.addresses]
+        self._executor = ThreadPoolExecutor(max_workers=CLIENT_THREADS_PER_SHARD * len(self.addresses),
+                                            thread_name_prefix="vector-shard")
+        self.shard_info = self._wait_for_shards(startup_timeout)
+
+        first = self.shard_info[0]
+        self.higher_is_better = first["higher_is_better"]
+        self.normalize_L2 = first["normalize_L2"]
+        versions = {info["manifest"]["source_version"] for info in self.shard_info}
+        counts = {info["manifest"]["shards"] for info in self.shard_info}
+        if len(versions) > 1 or counts != {len(self.addresses)}:
+            raise VectorShardError(f"Shards come from different splits (versions {versions}, shard counts {counts})")
+        self.source_version = versions.pop()
+        logger.info(f"Vector search uses {len(self.addresses)} shards: {self.snapshot()}")
+
+    def _wait_for_shards(self, startup_timeout):
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                return [self._call(shard, "info") for shard in range(len(self.addresses))]
+            except VectorShardError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
+
+    # ==================== RPC ====================
+    def _call(self, shard, operation, *arguments):
+        """
+        📡 Send one request to a shard on a pooled connection and return its reply
+
+        A pooled connection may have been closed by a shard restart, so a failed
+        send on a reused connection is retried once on a fresh one.
+        """
+        for attempt in range(2):
+            try:
+                connection, reused = self._idle[shard].get_nowait(), True
+            except queue.Empty:
+                try:
+                    connection, reused = Client(self.addresses[shard], authkey=self.authkey), False
+                except (OSError, multiprocessing.AuthenticationError) as error:
+                    raise VectorShardError(f"Cannot connect to shard {shard} at {self.addresses[shard]}: {error}") from error
+            try:
+                connection.send((operation, arguments))
+                if not connection.poll(self.timeout):
+                    connection.close()
+                    raise VectorShardError(f"Shard {shard} did not answer within {self.timeout}s")
+                status, payload = connection.recv()
+            except (OSError, EOFError) as error:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise VectorShardError(f"Shard {shard} connection failed: {error}") from error
+            self._idle[shard].put(connection)
+            if status != "ok":
+                raise VectorShardError(f"Shard {shard} failed: {payload}")
+            return payload
+
+    def _search_shard(self, shard, vector, namespaces, k):
+        try:
+            return self._call(shard, "search", vector, tuple(namespaces), k)
+        except VectorShardError as error:
+            logger.warning(f"Skipping vector shard: {error}")
+            return None
+
+    # ==================== SEARCH ====================
+    def embed(self, query):
+        """
+        🧮 Embed a query the way the shards' store does (normalised if it is)
+
+        Returns:
+            array: float32 matrix of shape (1, dimension)
+        """
+        vector = np.array([self.embeddings.embed_query(query)], dtype=np.float32)
+        if self.normalize_L2:
+            faiss.normalize_L2(vector)
+        return vector
+
+    def search_with_scores(self, query, namespaces, k=VECTOR_SEARCH_K, query_vector=None):
+        """
+        🔍 Ask every shard for its top k in the given namespaces and merge by score
+
+        Args:
+            query (str): Search text
+            namespaces (tuple): Namespaces to search
+            k (int): Number of chunks to return overall
+            query_vector (array): Precomputed embed(query), to avoid embedding twice
+
+        Returns:
+            list: (Document, score) pairs, best first
+
+        Raises:
+            VectorShardError: If no shard answered
+        """
+        vector = query_vector if query_vector is not None else self.embed(query)
+        results = list(self._executor.map(lambda shard: self._search_shard(shard, vector, namespaces, k),
+                                          range(len(self.addresses))))
+        if all(result is None for result in results):
+            raise VectorShardError("No vector shard answered")
+        hits = [hit for result in results if result for hit in result]
+        hits.sort(key=lambda hit: hit[2], reverse=self.higher_is_better)
+        return [(Document(page_content=content, metadata=metadata), score) for content, metadata, score in hits[:k]]
+
+    def search(self, query, namespaces, k=VECTOR_SEARCH_K, query_vector=None):
+        """
+        🔍 Like search_with_scores(), returning only the documents
+        """
+        return [document for document, _ in self.search_with_scores(query, namespaces, k, query_vector)]
+
+    def snapshot(self):
+        """
+        📊 Chunk counts per namespace across all shards (as of startup)
+        """
+        totals = {}
+        for info in self.shard_info:
+            for namespace, count in info["namespaces"].items():
+                totals[namespace] = totals.get(namespace, 0) + count
+        return totals
+
+    def version(self):
+        """
+        🏷️ Version of the store the shards were split from, for answer_index
+        """
+        return self.source_version
+
+
+# ==================== COMMAND LINE ====================
+def start_local_shards(shards, shard_dir=VECTOR_SHARD_DIR, host="127.0.0.1", base_port=VECTOR_SHARD_BASE_PORT):
+    """
+    🚀 Launch one serve process per shard on this machine
+
+    Returns:
+        list: subprocess.Popen handles, in shard order
+    """
+    script = os.path.abspath(__file__)
+    return [
+        subprocess.Popen([sys.executable, script, "serve", "--shard-path", os.path.join(shard_dir, f"shard-{shard}"),
+                          "--host", host, "--port", str(base_port + shard)])
+        for shard in range(shards)
+    ]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    parser = argparse.ArgumentParser(description="Split the FAISS store into shards and serve them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    split_parser = commands.add_parser("split", help="Write the store out as N shard stores")
+    split_parser.add_argument("--shards", type=int, required=True)
+    split_parser.add_argument("--store", default="vectorstore/db_faiss")
+    split_parser.add_argument("--output", default=VECTOR_SHARD_DIR)
+    serve_parser = commands.add_parser("serve", help="Serve one shard")
+    serve_parser.add_argument("--shard-path", required=True)
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Use 0.0.0.0 to serve other machines")
+    serve_parser.add_argument("--port", type=int, default=VECTOR_SHARD_BASE_PORT)
+    start_parser = commands.add_parser("start", help="Serve every shard of a split on this machine")
+    start_parser.add_argument("--shards", type=int, required=True)
+    start_parser.add_argument("--shard-dir", default=VECTOR_SHARD_DIR)
+    start_parser.add_argument("--host", default="127.0.0.1")
+    start_parser.add_argument("--base-port", type=int, default=VECTOR_SHARD_BASE_PORT)
+    args = parser.parse_args()
+
+    if args.command == "split":
+        full_store = FAISS.load_local(args.store, embeddings=None, allow_dangerous_deserialization=True)
+        written = split_store(full_store, args.shards, args.output, vector_store_version(args.store))
+        print(f"Wrote {len(written)} shards of {full_store.index.ntotal} chunks to {args.output}")
+    elif args.command == "serve":
+        ShardServer(args.shard_path, (args.host, args.port)).serve_forever()
+    else:
+        _authkey(VECTOR_SHARD_AUTHKEY)
+        processes = start_local_shards(args.shards, args.shard_dir, args.host, args.base_port)
+        print("VECTOR_SHARD_ADDRESSES=" + ",".join(f"{args.host}:{args.base_port + shard}" for shard in range(args.shards)))
+        # 🛑 Stop the shard processes too when this launcher is interrupted or terminated
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            for process in processes:
+                process.wait()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            for process in processes:
+                process.terminate()
@@ -32,6 +32,7 @@ const YouTubeAdvisorAMA = () => {
   const [response, setResponse] = useState("");          // Advisor response from API
   const [isLoading, setIsLoading] = useState(false);     // Loading state indicator
   const [error, setError] = useState("");               // Error message state
+  const [sessionId, setSessionId] = useState(null);      // Server-side conversation for follow-ups
 
   /**
    * Handle question input changes
@@ -91,7 +92,7 @@ const YouTubeAdvisorAMA = () => {
 
     try {
       // 🌐 Send request to backend API for advisor response
-      const apiResponse = await postData("/api/ama/ask", { question }, 15000);
+      const apiResponse = await postData("/api/ama/ask", { question, session_id: sessionId }, 15000);
       // 🎨 DEBUG: API response received - {apiResponse ? 'success' : 'error'}
 
       // 📋 Handle API response
@@ -100,6 +101,7 @@ const YouTubeAdvisorAMA = () => {
         // 🎨 DEBUG: API returned error - {apiResponse.error}
       } else {
         setResponse(apiResponse.data.answer || "No response received from advisor.");
+        setSessionId(apiResponse.data.session_id || null);
         // 🎨 DEBUG: Advisor response received successfully
       }
     } catch (error) {
@@ -1,5 +1,5 @@
 import React, { useState } from "react";
-import { postData } from "../utils/postData";
+import { postData, postFormData } from "../utils/postData";
 import LoadingState from "./LoadingState";
 import ErrorDisplay from "./ErrorDisplay";
 import "../styles/CommonStyles.css";
@@ -118,18 +118,19 @@ const LegalContractAnalyzer = () => {
     // 🎨 DEBUG: Starting contract analysis process
 
     try {
-      // 📦 Prepare payload with contract text
-      let payload = { text: contractText };
+      let apiResponse;
 
-      // 📄 If file is uploaded, extract and append text content
+      // 📄 If file is uploaded, send it as multipart so the backend extracts the PDF text
       if (file) {
-        const fileText = await file.text();
-        payload.text += `\n${fileText}`;
-        // 🎨 DEBUG: PDF content appended to payload - {fileText.length} characters
+        const formData = new FormData();
+        formData.append("file", file);
+        formData.append("text", contractText);
+        apiResponse = await postFormData("/api/contract/upload", formData, 60000);
+        // 🎨 DEBUG: Contract file uploaded - {file.size} bytes
+      } else {
+        // 🌐 Send request to backend API for contract simplification
+        apiResponse = await postData("/api/contract/simplify", { text: contractText }, 20000);
       }
-
-      // 🌐 Send request to backend API for contract simplification
-      const apiResponse = await postData("/api/contract/simplify", payload, 20000);
       // 🎨 DEBUG: API response received - {apiResponse ? 'success' : 'error'}
 
       // 📋 Handle API response
@@ -254,7 +255,7 @@ const LegalContractAnalyzer = () => {
         {/* 📄 PDF FILE UPLOAD */}
         <input
           type="file"
-          accept=".pdf"
+          accept=".pdf,.txt"
           onChange={handleFileUpload}
           disabled={isLoading(componentId)}
           className="component-file-input"
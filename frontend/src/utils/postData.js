@@ -27,4 +27,33 @@ export async function postData(url = "", data = {}, timeout = 10000) {
     }
     return { error: error.message || "Network error - please check your connection" };
   }
-}
\ No newline at end of file
+}
+
+// Multipart upload (files are streamed to disk by the backend, so no JSON encoding)
+export async function postFormData(url = "", formData = new FormData(), timeout = 60000) {
+  try {
+    // Create AbortController for timeout handling
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), timeout);
+
+    // Let the browser set the multipart Content-Type with its boundary
+    const response = await fetch(url, {
+      method: "POST",
+      body: formData,
+      signal: controller.signal
+    });
+
+    clearTimeout(timeoutId);
+
+    if (!response.ok) {
+      throw new Error(`Server error: ${response.status} - ${response.statusText}`);
+    }
+
+    return await response.json();
+  } catch (error) {
+    if (error.name === 'AbortError') {
+      return { error: "Request timeout - please try again" };
+    }
+    return { error: error.message || "Network error - please check your connection" };
+  }
+}